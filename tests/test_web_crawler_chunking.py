@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_DIR = PROJECT_ROOT / "universal_skills" / "research" / "web-crawler" / "scripts"
+
+
+def _crawl():
+    pytest.importorskip("agent_utilities")
+    sys.path.insert(0, str(SCRIPT_DIR))
+    return importlib.import_module("crawl")
+
+
+def test_small_sections_split_only_at_top_level_headers() -> None:
+    crawl = _crawl()
+    markdown = "intro\n\n# One\nfirst\n\n### Deep\nstill first\n\n## Two\nsecond"
+    assert crawl.split_markdown_chunks(markdown) == [
+        "intro",
+        "# One\nfirst\n\n### Deep\nstill first",
+        "## Two\nsecond",
+    ]
+
+
+def test_oversized_section_falls_back_to_finer_separators() -> None:
+    crawl = _crawl()
+    limit = crawl._CHUNK_SOFT_MAX_CHARS
+    paragraph = "word " * (limit // 10)
+    markdown = "# Big\n\n" + "\n\n".join(paragraph.strip() for _ in range(6))
+    chunks = crawl.split_markdown_chunks(markdown)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= limit for chunk in chunks)
+    assert chunks[0].startswith("# Big")
+
+
+def test_fenced_code_and_tables_are_never_split() -> None:
+    crawl = _crawl()
+    limit = crawl._CHUNK_SOFT_MAX_CHARS
+    code = "```bash\n# not a header\n" + "echo hi. " * (limit // 4) + "\n```"
+    table = "| a | b |\n|---|---|\n" + "| x. y | z |\n" * 10
+    markdown = f"# Title\n\nBefore.\n\n{code}\n\n{table}\n\n## Next\nafter"
+    chunks = crawl.split_markdown_chunks(markdown)
+    assert any(code in chunk for chunk in chunks)
+    assert any(table.rstrip("\n") in chunk for chunk in chunks)
+    assert chunks[-1] == "## Next\nafter"
+    assert not any("\x00" in chunk for chunk in chunks)
+
+
+def test_chunk_iterator_is_lazy_and_folds_overflow_into_last_chunk() -> None:
+    crawl = _crawl()
+    cap = crawl._MAX_CHUNKS_PER_PAGE
+    markdown = "\n".join(f"# H{i}\nbody {i}" for i in range(cap + 3))
+    chunks = crawl.iter_markdown_chunks(markdown)
+    assert next(chunks) == "# H0\nbody 0"
+    rest = list(chunks)
+    assert len(rest) == cap - 1
+    assert rest[-1].startswith(f"# H{cap - 1}\n")
+    assert rest[-1].endswith(f"# H{cap + 2}\nbody {cap + 2}")
+
+
+def test_placeholder_lookalikes_in_page_text_are_inert() -> None:
+    crawl = _crawl()
+    fence = "```\ncode\n```"
+    chunks = crawl.split_markdown_chunks(
+        f"# a\nhello \x00BLOCK7\x00 there \x00BLOCK0\x00\n\n{fence}\n"
+    )
+    assert "".join(chunks).count(fence) == 1
+    assert "\x00" not in "".join(chunks)
+
+
+def test_list_items_are_never_split() -> None:
+    crawl = _crawl()
+    item = "- " + " ".join(f"Sentence {n} of the item." for n in range(120))
+    chunks = crawl.split_markdown_chunks(f"# T\n\nintro\n\n{item}\n- second\n")
+    assert sum(item in chunk for chunk in chunks) == 1
+    assert any(chunk.endswith("- second") for chunk in chunks)
+
+
+def test_fence_is_closed_only_by_a_bare_fence_line() -> None:
+    crawl = _crawl()
+    body = " ".join(f"line {n} of code." for n in range(400))
+    fence = f"```\nstart\n```py\n{body}\n```"
+    chunks = crawl.split_markdown_chunks(f"# A\n\n{fence}\n\n## B\nafter\n")
+    assert any(fence in chunk for chunk in chunks)
+    assert chunks[-1] == "## B\nafter"
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import importlib
+import os
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
@@ -17,6 +20,11 @@ def _runtime():
     return importlib.import_module("security_runtime")
 
 
+def _crawl():
+    _runtime()
+    return importlib.import_module("crawl")
+
+
 def _policy(tmp_path: Path):
     runtime = _runtime()
     workspace = tmp_path / "workspace"
@@ -100,6 +108,179 @@ def test_output_escape_and_symlink_are_rejected(tmp_path: Path) -> None:
         policy.resolve_output_dir("linked-output")
 
 
+def test_dangling_symlink_at_output_target_is_rejected(tmp_path: Path) -> None:
+    runtime = _runtime()
+    policy = _policy(tmp_path)
+    output = policy.resolve_output_dir("crawl-output")
+    url = "https://source.example/docs/page"
+    assert policy.write_markdown(output, "first", url)
+    (written,) = output.glob("*.md")
+    written.unlink()
+    try:
+        written.symlink_to(tmp_path / "missing.md")
+    except OSError:
+        pytest.skip("symlinks are unavailable on this platform")
+    with pytest.raises(runtime.CrawlerSecurityError):
+        policy.write_markdown(output, "second", url)
+    assert not (tmp_path / "missing.md").exists()
+
+
+def test_output_path_through_a_file_is_rejected_with_a_code(tmp_path: Path) -> None:
+    runtime = _runtime()
+    policy = _policy(tmp_path)
+    output = policy.resolve_output_dir("crawl-output")
+    (output / "blocker").write_text("not a directory", encoding="utf-8")
+    with pytest.raises(runtime.CrawlerSecurityError, match="not_directory"):
+        policy.resolve_output_dir("crawl-output/blocker/pages")
+
+
+def test_resume_checkpoint_stores_opaque_keys_and_skips_saved_pages(
+    tmp_path: Path,
+) -> None:
+    crawl = _crawl()
+    policy = _policy(tmp_path)
+    output = policy.resolve_output_dir("crawl-output")
+    done = "https://source.example/docs/done"
+    todo = "https://source.example/docs/todo"
+    checkpoint = crawl.CrawlCheckpoint(policy, output)
+    checkpoint.mark(done)
+    checkpoint.flush()
+    stored = (output / ".crawl-checkpoint").read_text(encoding="utf-8")
+    assert "source.example" not in stored
+    resumed = crawl.CrawlCheckpoint(policy, output)
+    assert resumed.remaining([done, todo]) == [todo]
+
+
+def test_checkpoint_failure_keeps_writers_alive_and_pending_keys(
+    tmp_path: Path, monkeypatch
+) -> None:
+    crawl = _crawl()
+    runtime = _runtime()
+    policy = _policy(tmp_path)
+    output = policy.resolve_output_dir("crawl-output")
+
+    def failing_write(descriptor, data):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(runtime, "_write_all", failing_write)
+    checkpoint = crawl.CrawlCheckpoint(policy, output)
+    checkpoint.mark("https://source.example/docs/one")
+    with pytest.raises(runtime.CrawlerSecurityError):
+        checkpoint.flush()
+    assert len(checkpoint._pending) == 1
+
+    def failing_mark(url):
+        raise OSError("boom")
+
+    async def fake_save(content, url, output_dir, policy):
+        return True
+
+    monkeypatch.setattr(crawl, "save_markdown", fake_save)
+
+    async def run() -> int:
+        pool = crawl._MarkdownWriterPool(
+            output, policy, writers=1, on_saved=failing_mark
+        )
+        for index in range(4):
+            await pool.put(f"page {index}", f"https://source.example/docs/{index}")
+        return await pool.close()
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=10)) == 4
+
+
+def test_symlinked_checkpoint_is_rejected(tmp_path: Path) -> None:
+    runtime = _runtime()
+    policy = _policy(tmp_path)
+    output = policy.resolve_output_dir("crawl-output")
+    try:
+        (output / ".crawl-checkpoint").symlink_to(tmp_path / "elsewhere")
+    except OSError:
+        pytest.skip("symlinks are unavailable on this platform")
+    with pytest.raises(runtime.CrawlerSecurityError):
+        policy.load_checkpoint(output)
+    with pytest.raises(runtime.CrawlerSecurityError):
+        policy.append_checkpoint(output, ["key"])
+    assert not (tmp_path / "elsewhere").exists()
+
+
+def test_fifo_checkpoint_is_rejected_without_blocking(tmp_path: Path) -> None:
+    runtime = _runtime()
+    policy = _policy(tmp_path)
+    output = policy.resolve_output_dir("crawl-output")
+    if not hasattr(os, "mkfifo"):
+        pytest.skip("FIFOs are unavailable on this platform")
+    os.mkfifo(output / ".crawl-checkpoint")
+    with pytest.raises(runtime.CrawlerSecurityError):
+        policy.load_checkpoint(output)
+    with pytest.raises(runtime.CrawlerSecurityError):
+        policy.append_checkpoint(output, ["key"])
+
+
+def test_recursive_crawl_harvests_only_in_scope_links(tmp_path: Path) -> None:
+    crawl = _crawl()
+    policy = _policy(tmp_path)
+    output = policy.resolve_output_dir("crawl-output")
+    fetched: list[str] = []
+
+    class _Crawler:
+        async def arun_many(self, urls, config=None, dispatcher=None):
+            fetched.extend(urls)
+            return [
+                SimpleNamespace(
+                    success=True,
+                    url=url,
+                    markdown=f"# {url}\n\nunique body for {url}",
+                    links={
+                        "internal": [
+                            {"href": url + "-child"},
+                            {"href": "/blog/post"},
+                            {"href": "https://other.example/docs/page"},
+                        ]
+                    },
+                )
+                for url in urls
+            ]
+
+    asyncio.run(
+        crawl.crawl_recursive_high_speed(
+            _Crawler(),
+            ["https://source.example/docs/start"],
+            3,
+            None,
+            None,
+            output,
+            policy,
+        )
+    )
+    assert fetched == [
+        "https://source.example/docs/start",
+        "https://source.example/docs/start-child",
+        "https://source.example/docs/start-child-child",
+    ]
+    assert len(list(output.glob("*.md"))) == 3
+
+
+def test_streaming_arun_many_yields_as_pages_complete(tmp_path: Path) -> None:
+    crawl = _crawl()
+    crawler = crawl.SafeHttpCrawler(_policy(tmp_path), max_concurrent=1)
+    delays = {"https://source.example/slow": 0.05, "https://source.example/fast": 0}
+
+    async def fake_arun(*, url, config=None):
+        await asyncio.sleep(delays[url])
+        return SimpleNamespace(success=True, url=url)
+
+    crawler.arun = fake_arun
+
+    async def collect():
+        stream = await crawler.arun_many(urls=list(delays), stream=True)
+        return [result.url async for result in stream]
+
+    assert asyncio.run(collect()) == [
+        "https://source.example/fast",
+        "https://source.example/slow",
+    ]
+
+
 def test_kg_endpoint_rejects_query_and_oversized_token(tmp_path: Path) -> None:
     runtime = _runtime()
     policy = _policy(tmp_path)
@@ -123,3 +304,62 @@ def test_aggregate_output_budget_fails_closed() -> None:
     budget.consume(4)
     with pytest.raises(runtime.CrawlerSecurityError):
         budget.consume(1)
+
+
+def test_sitemap_parser_extracts_locs_and_rejects_entities() -> None:
+    crawl = _crawl()
+    runtime = _runtime()
+    index = (
+        b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        b"<sitemap><loc>https://source.example/a.xml</loc></sitemap>"
+        b"</sitemapindex>"
+    )
+    assert crawl.parse_bounded_sitemap_xml(index) == (
+        ["https://source.example/a.xml"],
+        [],
+    )
+    urlset = (
+        b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        + b"".join(
+            b"<url><loc>https://source.example/%d</loc></url>" % i for i in range(3)
+        )
+        + b"</urlset>"
+    )
+    assert crawl.parse_bounded_sitemap_xml(urlset)[1] == [
+        "https://source.example/0",
+        "https://source.example/1",
+        "https://source.example/2",
+    ]
+    with pytest.raises(runtime.CrawlerSecurityError):
+        crawl.parse_bounded_sitemap_xml(b'<!DOCTYPE x [<!ENTITY a "b">]><x/>')
+
+
+def test_probed_sitemap_body_is_reused_once_without_refetching(
+    tmp_path: Path, monkeypatch
+) -> None:
+    crawl = _crawl()
+    runtime = _runtime()
+    policy = _policy(tmp_path)
+    body = (
+        b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        b"<url><loc>https://source.example/docs/a</loc></url></urlset>"
+    )
+    fetches: list[str] = []
+
+    def fake_fetch_bytes(self, url, *, max_bytes):
+        fetches.append(url)
+        return body
+
+    def no_robots(self, url, *, max_bytes):
+        raise runtime.CrawlerSecurityError("missing")
+
+    monkeypatch.setattr(runtime.CrawlerSecurityPolicy, "fetch_bytes", fake_fetch_bytes)
+    monkeypatch.setattr(runtime.CrawlerSecurityPolicy, "fetch_text", no_robots)
+    probed: dict[str, bytes] = {}
+    sitemap = crawl.discover_sitemap("https://source.example/docs/", policy, probed)
+    assert sitemap == "https://source.example/sitemap.xml"
+    assert probed == {sitemap: body}
+    urls = asyncio.run(crawl.fetch_sitemap_urls(sitemap, policy, probed=probed))
+    assert urls == ["https://source.example/docs/a"]
+    assert fetches == [sitemap]
+    assert probed == {}
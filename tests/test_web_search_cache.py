@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import importlib
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_DIR = PROJECT_ROOT / "universal_skills" / "research" / "web-search" / "scripts"
+
+
+def _cache():
+    sys.path.insert(0, str(SCRIPT_DIR))
+    return importlib.import_module("search_cache")
+
+
+def test_cache_round_trips_with_private_file_and_opaque_key(tmp_path: Path) -> None:
+    search_cache = _cache()
+    path = tmp_path / "cache" / "web-search.sqlite3"
+    cache = search_cache.SearchCache(path, ttl=60)
+    key = search_cache.cache_key("first", "secret query", 5, "bing", "api-key")
+    cache.put(key, ["bing", [{"title": "t", "link": "l", "snippet": "s"}]])
+    assert cache.get(key) == ["bing", [{"title": "t", "link": "l", "snippet": "s"}]]
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    raw = path.read_bytes()
+    assert b"secret query" not in raw
+    assert b"api-key" not in raw
+
+
+def test_expired_and_disabled_entries_miss(tmp_path: Path, monkeypatch) -> None:
+    search_cache = _cache()
+    path = tmp_path / "web-search.sqlite3"
+    cache = search_cache.SearchCache(path, ttl=60)
+    cache.put("key", ["duckduckgo", []])
+    monkeypatch.setattr(search_cache.time, "time", lambda: 10**12)
+    assert cache.get("key") is None
+    assert search_cache.SearchCache(path, ttl=0).get("key") is None
+    assert search_cache.ttl_from_env({"WEB_SEARCH_CACHE_TTL": "bogus"}) == 0.0
+
+
+def test_symlinked_cache_file_is_treated_as_a_miss(tmp_path: Path) -> None:
+    search_cache = _cache()
+    path = tmp_path / "web-search.sqlite3"
+    try:
+        path.symlink_to(tmp_path / "elsewhere")
+    except OSError:
+        pytest.skip("symlinks are unavailable on this platform")
+    cache = search_cache.SearchCache(path, ttl=60)
+    cache.put("key", ["duckduckgo", [{"title": "t"}]])
+    assert cache.get("key") is None
+    assert not (tmp_path / "elsewhere").exists()
+
+
+def test_corrupt_entries_behave_as_misses(tmp_path: Path, monkeypatch) -> None:
+    search_cache = _cache()
+    cache = search_cache.SearchCache(tmp_path / "web-search.sqlite3", ttl=60)
+    cache.put("key", ["bing", []])
+    with cache._transaction() as connection:
+        connection.execute("UPDATE results SET value = ?", ('["bing", [{"ti',))
+    assert cache.get("key") is None
+
+    pytest.importorskip("agent_utilities")
+    search = importlib.import_module("search")
+    fresh = [{"title": "t", "link": "l", "snippet": "s"}]
+    monkeypatch.setattr(search, "run_search_provider", lambda *args: fresh)
+    monkeypatch.setattr(cache, "get", lambda key: {"provider": "bing"})
+    assert search.dispatch_search("q", 5, {"duckduckgo": ()}, cache=cache) == (
+        "duckduckgo",
+        fresh,
+    )
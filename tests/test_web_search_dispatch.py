@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_DIR = PROJECT_ROOT / "universal_skills" / "research" / "web-search" / "scripts"
+
+
+def _search():
+    pytest.importorskip("agent_utilities")
+    sys.path.insert(0, str(SCRIPT_DIR))
+    return importlib.import_module("search")
+
+
+def test_provider_credentials_follow_priority_and_skip_partial_config() -> None:
+    search = _search()
+    credentials = search.provider_credentials(
+        {"GOOGLE_API_KEY": "key", "BING_API_KEY": "bing", "SEARXNG_URL": ""}
+    )
+    assert list(credentials) == ["bing", "duckduckgo"]
+    assert credentials["bing"] == ("bing",)
+    assert credentials["duckduckgo"] == ()
+
+
+def test_unknown_provider_is_rejected_before_dispatch() -> None:
+    search = _search()
+    with pytest.raises(ValueError):
+        search.run_search_provider("shell", "query", 5, {})
+
+
+def test_race_returns_first_non_empty_provider_result(monkeypatch, caplog) -> None:
+    search = _search()
+
+    def fake_run(provider, query, max_results, credentials):
+        if provider == "searxng":
+            raise RuntimeError("down")
+        if provider == "bing":
+            return []
+        return [{"title": provider, "link": "https://example.test", "snippet": ""}]
+
+    monkeypatch.setattr(search, "run_search_provider", fake_run)
+    provider, results = search.race_search_providers(
+        ["searxng", "bing", "duckduckgo"], "query", 5, {}
+    )
+    assert provider == "duckduckgo"
+    assert results[0]["title"] == "duckduckgo"
+
+    caplog.set_level("DEBUG", logger=search.logger.name)
+    with pytest.raises(RuntimeError):
+        search.race_search_providers(["searxng"], "query", 5, {})
+    assert "searxng search failed (RuntimeError)" in caplog.text
+
+
+def test_google_paginates_past_ten_results(monkeypatch) -> None:
+    _search()
+    google = importlib.import_module("search_google")
+    requested: list[tuple[int, int]] = []
+
+    def fake_fetch(url, params=None, **_kwargs):
+        requested.append((params["start"], params["num"]))
+        return {
+            "items": [
+                {"title": str(n), "link": f"https://r.example/{n}", "snippet": ""}
+                for n in range(params["start"], params["start"] + params["num"])
+            ]
+        }
+
+    monkeypatch.setattr(google, "fetch_json", fake_fetch)
+    results = google.search("query", "key", "cx", 25)
+    assert sorted(requested) == [(1, 10), (11, 10), (21, 5)]
+    assert [r["title"] for r in results] == [str(n) for n in range(1, 26)]
+
+
+def test_searxng_search_many_runs_queries_concurrently_in_order() -> None:
+    _search()
+    searxng = importlib.import_module("search_searxng")
+    requested: list[str] = []
+
+    def fake_fetch(url, *, params=None, headers=None):
+        requested.append(url)
+        hits = [{"title": params["q"], "url": "u", "content": "c"}]
+        return json.dumps({"results": hits}).encode("utf-8"), "utf-8"
+
+    batches = asyncio.run(
+        searxng.search_many(
+            ["one", "two", "three"], "https://sx.example/", 5, fetch=fake_fetch
+        )
+    )
+    assert [batch[0]["title"] for batch in batches] == ["one", "two", "three"]
+    assert set(requested) == {"https://sx.example/search"}
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_searxng_rejects_non_object_bodies_on_both_paths(
+    monkeypatch, streaming: bool
+) -> None:
+    _search()
+    searxng = importlib.import_module("search_searxng")
+    if streaming:
+        monkeypatch.setattr(searxng, "ijson", pytest.importorskip("ijson"))
+    else:
+        monkeypatch.setattr(searxng, "ijson", None)
+
+    def fake_fetch(url, *, params=None, headers=None):
+        return b'[{"results": [{"title": "t"}]}]', "utf-8"
+
+    with pytest.raises(RuntimeError) as excinfo:
+        searxng.search("q", "https://sx.example/", 5, fetch=fake_fetch)
+    assert "invalid JSON shape" in str(excinfo.value.__cause__)
+
+
+def test_duckduckgo_flattens_nested_topics_and_stops_at_limit(monkeypatch) -> None:
+    _search()
+    ddg = importlib.import_module("search_duckduckgo")
+    data = {
+        "RelatedTopics": [
+            {"Text": "a", "FirstURL": "https://d/a"},
+            {"Name": "group", "Topics": [{"Text": "b", "FirstURL": "https://d/b"}]},
+            {"Text": "no link"},
+            {"Text": "c", "FirstURL": "https://d/c"},
+        ]
+    }
+    monkeypatch.setattr(ddg, "fetch_json", lambda url, **_kwargs: data)
+    results = ddg.search("query", 2)
+    assert results == [
+        {"title": "a", "link": "https://d/a", "snippet": "a"},
+        {"title": "b", "link": "https://d/b", "snippet": "b"},
+    ]
+
+
+def test_batch_answers_lines_in_order_and_reports_bad_lines(monkeypatch) -> None:
+    search = _search()
+
+    def fake_run(provider, query, max_results, credentials):
+        return [{"title": query, "link": "l", "snippet": str(max_results)}]
+
+    monkeypatch.setattr(search, "run_search_provider", fake_run)
+    lines = ['{"query": "one", "max_results": 2}\n', "\n", "oops\n", '{"query": "two"}']
+    records = search.run_batch(lines, 7, {"duckduckgo": ()})
+    assert records == [
+        {
+            "line": 1,
+            "provider": "duckduckgo",
+            "results": [{"title": "one", "link": "l", "snippet": "2"}],
+        },
+        {"line": 3, "error": "invalid batch line"},
+        {
+            "line": 4,
+            "provider": "duckduckgo",
+            "results": [{"title": "two", "link": "l", "snippet": "7"}],
+        },
+    ]
+
+
+def test_batch_reports_lines_past_the_cap(monkeypatch) -> None:
+    search = _search()
+    monkeypatch.setattr(search, "_MAX_BATCH_QUERIES", 2)
+    monkeypatch.setattr(search, "run_search_provider", lambda *args: [])
+    lines = [json.dumps({"query": str(n)}) for n in range(4)]
+    records = search.run_batch(lines, 5, {"duckduckgo": ()})
+    assert [record["line"] for record in records] == [1, 2, 3, 4]
+    assert records[2:] == [
+        {"line": 3, "error": "batch limit of 2 exceeded"},
+        {"line": 4, "error": "batch limit of 2 exceeded"},
+    ]
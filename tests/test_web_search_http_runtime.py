@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import gzip
+import importlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_DIR = PROJECT_ROOT / "universal_skills" / "research" / "web-search" / "scripts"
+
+
+def _runtime(monkeypatch):
+    pytest.importorskip("agent_utilities")
+    sys.path.insert(0, str(SCRIPT_DIR))
+    runtime = importlib.import_module("http_runtime")
+    monkeypatch.setattr(runtime, "_egress_limits", lambda: {})
+    monkeypatch.setattr(runtime.time, "sleep", lambda _seconds: None)
+    return runtime
+
+
+class _Throttled(Exception):
+    def __init__(self, status: int) -> None:
+        super().__init__("throttled")
+        self.response = SimpleNamespace(status_code=status)
+
+
+def test_fetch_json_retries_throttling_then_succeeds(monkeypatch) -> None:
+    runtime = _runtime(monkeypatch)
+    replies = [_Throttled(429), _Throttled(503), (b'{"ok": true}', "utf-8")]
+
+    def fake_get(url, **_kwargs):
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(runtime, "safe_get_bytes", fake_get)
+    assert runtime.fetch_json("https://search.example/api") == {"ok": True}
+    assert replies == []
+
+
+def test_fetch_json_does_not_retry_policy_denials(monkeypatch) -> None:
+    runtime = _runtime(monkeypatch)
+    calls = []
+
+    def fake_get(url, **_kwargs):
+        calls.append(url)
+        raise runtime.SourceEgressError("denied")
+
+    monkeypatch.setattr(runtime, "safe_get_bytes", fake_get)
+    with pytest.raises(runtime.SourceEgressError):
+        runtime.fetch_json("https://search.example/api")
+    assert len(calls) == 1
+
+
+def test_fetch_json_gives_up_after_bounded_retries(monkeypatch) -> None:
+    runtime = _runtime(monkeypatch)
+    calls = []
+
+    def fake_get(url, **_kwargs):
+        calls.append(url)
+        raise _Throttled(429)
+
+    monkeypatch.setattr(runtime, "safe_get_bytes", fake_get)
+    with pytest.raises(_Throttled):
+        runtime.fetch_json("https://search.example/api")
+    assert len(calls) == runtime._SEARCH_RETRIES + 1
+
+
+def test_fetch_json_retries_transport_errors_but_not_bugs(monkeypatch) -> None:
+    runtime = _runtime(monkeypatch)
+    replies = [ConnectionResetError(), (b'{"ok": true}', "utf-8")]
+
+    def flaky_get(url, **_kwargs):
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(runtime, "safe_get_bytes", flaky_get)
+    assert runtime.fetch_json("https://search.example/api") == {"ok": True}
+
+    calls = []
+
+    def buggy_get(url, **_kwargs):
+        calls.append(url)
+        raise KeyError("missing")
+
+    monkeypatch.setattr(runtime, "safe_get_bytes", buggy_get)
+    with pytest.raises(KeyError):
+        runtime.fetch_json("https://search.example/api")
+    assert len(calls) == 1
+
+
+def test_gzip_body_is_inflated_within_the_response_cap(monkeypatch) -> None:
+    runtime = _runtime(monkeypatch)
+    payload = gzip.compress(b'{"results": []}')
+    monkeypatch.setattr(runtime, "safe_get_bytes", lambda url, **_: (payload, None))
+    assert runtime.fetch_json("https://search.example/api") == {"results": []}
+
+    bomb = gzip.compress(b" " * (runtime._SEARCH_RESPONSE_LIMIT + 1))
+    monkeypatch.setattr(runtime, "safe_get_bytes", lambda url, **_: (bomb, None))
+    with pytest.raises(ValueError):
+        runtime.fetch_json("https://search.example/api")
+
+
+def test_retry_delay_honours_retry_after_and_jitters_otherwise(monkeypatch) -> None:
+    runtime = _runtime(monkeypatch)
+    throttled = _Throttled(429)
+    throttled.response.headers = {"Retry-After": "3"}
+    assert runtime._retry_delay(throttled, 0) == 3.0
+    throttled.response.headers = {"Retry-After": "3600"}
+    assert runtime._retry_delay(throttled, 0) == runtime._RETRY_MAX_DELAY
+    step = runtime._RETRY_BASE_DELAY * 2
+    delays = {runtime._retry_delay(_Throttled(503), 1) for _ in range(20)}
+    assert all(step / 2 <= delay <= step for delay in delays)
+    assert len(delays) > 1
+
+
+def test_fetch_json_decodes_utf8_bytes_and_transcodes_other_charsets(
+    monkeypatch,
+) -> None:
+    runtime = _runtime(monkeypatch)
+    replies = [
+        ('{"q": "café"}'.encode(), None),
+        ('{"q": "café"}'.encode("latin-1"), "ISO-8859-1"),
+    ]
+    monkeypatch.setattr(runtime, "safe_get_bytes", lambda url, **_: replies.pop(0))
+    assert runtime.fetch_json("https://search.example/api") == {"q": "café"}
+    assert runtime.fetch_json("https://search.example/api") == {"q": "café"}
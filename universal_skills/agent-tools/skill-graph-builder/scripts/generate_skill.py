@@ -21,6 +21,7 @@ where agent-utilities is importable; if it is not, it tells you how to install i
 import argparse
 import hashlib
 import json
+import os
 import re
 import shutil
 import subprocess
@@ -193,8 +194,19 @@ def _make_crawler_fn(crawl_opts: dict):
             if crawl_opts.get("wait_for"):
                 cmd.extend(["--wait-for", crawl_opts["wait_for"]])
             subprocess.run(cmd, check=True)
+            # The crawler writes a flat directory of ``page-*.md`` files, so a
+            # single scandir pass with a suffix check replaces the glob walk.
+            with os.scandir(tmp) as it:
+                md_files = sorted(
+                    (
+                        Path(e.path)
+                        for e in it
+                        if e.is_file(follow_symlinks=False) and e.name.endswith(".md")
+                    ),
+                    key=lambda p: p.name,
+                )
             docs: list[AcquiredDoc] = []
-            for p in sorted(tmp.rglob("*.md")):
+            for p in md_files:
                 docs.append(
                     AcquiredDoc(
                         rel_path=p.relative_to(tmp).as_posix(),
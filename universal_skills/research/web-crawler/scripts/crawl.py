@@ -6,11 +6,14 @@ import logging
 import os
 import re
 import sys
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
 from dataclasses import dataclass, field
+from functools import lru_cache
 from html.parser import HTMLParser
+from itertools import islice, pairwise
 from pathlib import Path
 from typing import Any
-from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.parse import urldefrag, urljoin, urlsplit
 from xml.etree import ElementTree
 
 try:
@@ -54,24 +57,21 @@ except ImportError:
     MemoryAdaptiveDispatcher = None
     PruningContentFilter = None
 
-try:
-    import psutil
+try:  # ``resource`` is POSIX-only.
+    import resource
 except ImportError:
-    psutil = None
+    resource = None
 
 
-def log_memory(process, peak_memory, prefix: str = ""):
-    if process is None:
-        return
-    try:
-        current_mem = process.memory_info().rss  # in bytes
-    except Exception:
+def log_memory(prefix: str = ""):
+    """Log the process peak RSS, which the kernel already tracks for us."""
+
+    if resource is None:
         return
-    if current_mem > peak_memory[0]:
-        peak_memory[0] = current_mem
-    logger.info(
-        f"{prefix} Current Memory: {current_mem // (1024 * 1024)} MB, Peak: {peak_memory[0] // (1024 * 1024)} MB"
-    )
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ``ru_maxrss`` is reported in bytes on macOS and in KiB elsewhere.
+    peak_mb = peak // (1024 * 1024) if sys.platform == "darwin" else peak // 1024
+    logger.info(f"{prefix} Peak Memory: {peak_mb} MB")
 
 
 def _prefer_fit(markdown_obj) -> str:
@@ -92,15 +92,24 @@ def _prefer_fit(markdown_obj) -> str:
 
 
 def extract_markdown(result, policy: CrawlerSecurityPolicy) -> str:
-    md = ""
-    if hasattr(result, "markdown_v2") and result.markdown_v2:
-        md = _prefer_fit(result.markdown_v2)
-    elif hasattr(result, "markdown") and hasattr(result.markdown, "raw_markdown"):
-        md = _prefer_fit(result.markdown)
-    elif hasattr(result, "markdown") and isinstance(result.markdown, str):
-        md = result.markdown
+    # One attribute fetch per field; the branches depend on values, not on the
+    # result type, so a per-type dispatch cache would not be sound here.
+    markdown_v2 = getattr(result, "markdown_v2", None)
+    if markdown_v2:
+        md = _prefer_fit(markdown_v2)
     else:
-        md = str(getattr(result, "markdown", ""))
+        markdown = getattr(result, "markdown", "")
+        # An exact ``str`` can never carry ``raw_markdown``; skip the probe,
+        # whose miss costs a raised-and-caught AttributeError.
+        if type(markdown) is str:
+            md = markdown
+        # crawl4ai's markdown object is a ``str`` subclass, so test it first.
+        elif hasattr(markdown, "raw_markdown"):
+            md = _prefer_fit(markdown)
+        elif isinstance(markdown, str):
+            md = markdown
+        else:
+            md = str(markdown)
 
     clean, redactions = policy.sanitize_content(clean_markdown(md.strip()))
     if redactions:
@@ -111,9 +120,40 @@ def extract_markdown(result, policy: CrawlerSecurityPolicy) -> str:
 _MULTI_BLANK_RE = re.compile(r"\n{3,}")
 _TRAILING_WS_RE = re.compile(r"[ \t]+\n")
 _FINGERPRINT_WS_RE = re.compile(r"\s+")
+_HEADER_RE = re.compile(r"^(# .+|## .+)$", re.MULTILINE)
 _MAX_XML_ELEMENTS = 30_000
 _MAX_XML_DEPTH = 64
 _MAX_CHUNKS_PER_PAGE = 512
+_CHUNK_SOFT_MAX_CHARS = 1_500
+# Finer split points tried, in priority order, on a header section that is still
+# larger than the soft chunk size: deeper headings, paragraph breaks, then
+# sentence ends. Each pattern carries the text that re-joins packed pieces.
+_CHUNK_SEPARATORS: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"^(?=### )", re.MULTILINE), ""),
+    (re.compile(r"^(?=#### )", re.MULTILINE), ""),
+    (re.compile(r"^(?=##### )", re.MULTILINE), ""),
+    (re.compile(r"^(?=###### )", re.MULTILINE), ""),
+    (re.compile(r"\n{2,}"), "\n\n"),
+    (re.compile(r"(?<=[.!?])[ \t]+"), " "),
+)
+# Fenced code blocks, pipe tables, and list items (with their indented
+# continuation lines) are atomic: they are swapped for opaque placeholders
+# before splitting and restored inside whichever chunk holds them.
+_ATOMIC_BLOCK_RE = re.compile(
+    r"^(```|~~~)[^\n]*\n(?s:.*?)^\1[ \t]*$"
+    r"|^\|[^\n]*\|[ \t]*(?:\n\|[^\n]*\|[ \t]*)*$"
+    r"|^[ \t]*(?:[-*+]|\d+[.)])[ \t][^\n]*(?:\n[ \t]+\S[^\n]*)*$",
+    re.MULTILINE,
+)
+_ATOMIC_PLACEHOLDER_RE = re.compile(r"\x00BLOCK(\d+)\x00")
+_SITEMAP_FETCH_CONCURRENCY = 8
+_WRITER_POOL_SIZE = 4
+# One pass over the page instead of a substring scan per blocked-page marker.
+_BLOCKED_RE = re.compile(r"Access Denied|permission to access")
+_SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+_SITEMAP_LOC = _SITEMAP_NS + "loc"
+_SITEMAP_ENTRY = _SITEMAP_NS + "sitemap"
+_SITEMAP_URL = _SITEMAP_NS + "url"
 
 
 def clean_markdown(md: str) -> str:
@@ -158,43 +198,132 @@ def is_duplicate_content(
     return False
 
 
-def parse_bounded_sitemap_xml(body: bytes) -> Any:
-    """Parse sitemap XML with explicit entity, element, and depth ceilings."""
+def _split_oversized(text: str, level: int = 0) -> list[str]:
+    """Recursively split ``text`` on the coarsest separator that fits the soft size.
+
+    Adjacent pieces are packed back together up to ``_CHUNK_SOFT_MAX_CHARS`` so a
+    finer separator never produces a run of tiny chunks.
+    """
+    if len(text) <= _CHUNK_SOFT_MAX_CHARS or level >= len(_CHUNK_SEPARATORS):
+        return [text]
+    pattern, joiner = _CHUNK_SEPARATORS[level]
+    pieces = [piece for piece in pattern.split(text) if piece.strip()]
+    if len(pieces) <= 1:
+        return _split_oversized(text, level + 1)
+    chunks: list[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(joiner) + len(piece) > _CHUNK_SOFT_MAX_CHARS:
+            chunks.extend(_split_oversized(current, level + 1))
+            current = piece
+        else:
+            current = f"{current}{joiner}{piece}" if current else piece
+    if current:
+        chunks.extend(_split_oversized(current, level + 1))
+    return chunks
+
+
+def iter_markdown_chunks(markdown: str) -> Iterator[str]:
+    """Yield page markdown split at H1/H2 sections, shrinking any oversized section.
+
+    Sections above the soft size are split recursively on deeper headings,
+    paragraph breaks, and finally sentence ends. Fenced code blocks and tables
+    are never cut. Chunks are produced lazily so callers can write each one and
+    drop it; at most ``_MAX_CHUNKS_PER_PAGE`` are yielded and any overflow is
+    folded into the last chunk.
+    """
+    blocks: list[str] = []
+
+    def _stash(match: re.Match[str]) -> str:
+        blocks.append(match.group(0))
+        return f"\x00BLOCK{len(blocks) - 1}\x00"
+
+    def _unstash(match: re.Match[str]) -> str:
+        index = int(match.group(1))
+        return blocks[index] if index < len(blocks) else match.group(0)
+
+    def _restore(chunk: str) -> str:
+        if not blocks:
+            return chunk
+        return _ATOMIC_PLACEHOLDER_RE.sub(_unstash, chunk)
+
+    # NUL never belongs in markdown; dropping it keeps page text from forging
+    # a placeholder that would pull a stashed block into the wrong chunk.
+    markdown = _ATOMIC_BLOCK_RE.sub(_stash, markdown.replace("\x00", ""))
+    headers = [match.start() for match in _HEADER_RE.finditer(markdown)]
+    if not headers or headers[0] != 0:
+        headers.insert(0, 0)
+    headers.append(len(markdown))
+    pieces = (
+        stripped
+        for start, end in pairwise(headers)
+        if (section := markdown[start:end].strip())
+        for piece in _split_oversized(section)
+        if (stripped := piece.strip())
+    )
+    yield from map(_restore, islice(pieces, _MAX_CHUNKS_PER_PAGE - 1))
+    overflow = list(pieces)
+    if overflow:
+        yield _restore("\n\n".join(overflow))
+
+
+def split_markdown_chunks(markdown: str) -> list[str]:
+    """Return every chunk of ``markdown`` as a list (see ``iter_markdown_chunks``)."""
+
+    return list(iter_markdown_chunks(markdown))
+
+
+def parse_bounded_sitemap_xml(body: bytes) -> tuple[list[str], list[str]]:
+    """Stream sitemap ``<loc>`` values with entity, element, and depth ceilings.
+
+    Returns ``(child_sitemaps, page_urls)``. Each top-level ``<sitemap>`` /
+    ``<url>`` entry is dropped from the tree as soon as its end tag is read, so
+    peak memory tracks the extracted strings rather than the whole document.
+    """
 
     upper_body = body.upper()
     if b"<!DOCTYPE" in upper_body or b"<!ENTITY" in upper_body:
         raise CrawlerSecurityError("crawler_sitemap_unsafe_xml")
     parser = ElementTree.XMLPullParser(events=("start", "end"))
-    depth = 0
     elements = 0
     root = None
+    open_tags: list[str] = []
+    child_sitemaps: list[str] = []
+    page_urls: list[str] = []
 
     def consume_events() -> None:
-        nonlocal depth, elements, root
+        nonlocal elements, root
         for event, element in parser.read_events():
             if event == "start":
-                depth += 1
+                open_tags.append(element.tag)
                 elements += 1
                 if root is None:
                     root = element
-                if depth > _MAX_XML_DEPTH or elements > _MAX_XML_ELEMENTS:
+                if len(open_tags) > _MAX_XML_DEPTH or elements > _MAX_XML_ELEMENTS:
                     raise CrawlerSecurityError("crawler_sitemap_structure_too_large")
-            else:
-                depth -= 1
-                if depth < 0:
-                    raise CrawlerSecurityError("crawler_sitemap_invalid")
+                continue
+            if not open_tags:
+                raise CrawlerSecurityError("crawler_sitemap_invalid")
+            open_tags.pop()
+            if element.tag == _SITEMAP_LOC and element.text and open_tags:
+                if open_tags[-1] == _SITEMAP_ENTRY:
+                    child_sitemaps.append(element.text)
+                elif open_tags[-1] == _SITEMAP_URL:
+                    page_urls.append(element.text)
+            if len(open_tags) == 1 and root is not None:
+                root.remove(element)
 
     for offset in range(0, len(body), 64 * 1024):
         parser.feed(body[offset : offset + 64 * 1024])
         consume_events()
     parser.close()
     consume_events()
-    if root is None or depth != 0:
+    if root is None or open_tags:
         raise CrawlerSecurityError("crawler_sitemap_invalid")
-    return root
+    return child_sitemaps, page_urls
 
 
-def save_markdown(
+def _save_markdown_sync(
     content: str,
     url: str,
     output_dir: Path | None,
@@ -216,6 +345,125 @@ def save_markdown(
         return False
 
 
+async def save_markdown(
+    content: str,
+    url: str,
+    output_dir: Path | None,
+    policy: CrawlerSecurityPolicy,
+    prefix: str = "",
+) -> bool:
+    """Persist one page on a worker thread so the event loop keeps crawling."""
+
+    return await asyncio.to_thread(
+        _save_markdown_sync, content, url, output_dir, policy, prefix
+    )
+
+
+def _save_chunks_sync(
+    chunks: Iterable[str],
+    url: str,
+    output_dir: Path | None,
+    policy: CrawlerSecurityPolicy,
+) -> int:
+    return sum(
+        _save_markdown_sync(chunk, url, output_dir, policy, f"chunk-{idx}")
+        for idx, chunk in enumerate(chunks, start=1)
+    )
+
+
+async def save_markdown_chunks(
+    chunks: Iterable[str],
+    url: str,
+    output_dir: Path | None,
+    policy: CrawlerSecurityPolicy,
+) -> int:
+    """Persist every chunk of one page in a single worker-thread job.
+
+    ``chunks`` may be a lazy iterator; it is consumed on the worker thread so
+    each chunk is written and released before the next one is split off.
+    """
+
+    return await asyncio.to_thread(_save_chunks_sync, chunks, url, output_dir, policy)
+
+
+class _MarkdownWriterPool:
+    """Bounded queue drained by a few writer tasks so saves overlap crawling."""
+
+    def __init__(
+        self,
+        output_dir: Path | None,
+        policy: CrawlerSecurityPolicy,
+        writers: int = _WRITER_POOL_SIZE,
+        on_saved: Callable[[str], None] | None = None,
+    ) -> None:
+        self.output_dir = output_dir
+        self.policy = policy
+        self.on_saved = on_saved
+        self.saved = 0
+        self._queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue(
+            maxsize=writers * 2
+        )
+        self._tasks = [asyncio.create_task(self._drain()) for _ in range(writers)]
+
+    async def _drain(self) -> None:
+        while (item := await self._queue.get()) is not None:
+            content, url = item
+            if await save_markdown(content, url, self.output_dir, self.policy):
+                self.saved += 1
+                if self.on_saved:
+                    try:
+                        self.on_saved(url)
+                    except Exception:
+                        # A checkpoint failure must not kill the writer and stall put().
+                        logger.warning("Could not record crawl checkpoint")
+
+    async def put(self, content: str, url: str) -> None:
+        await self._queue.put((content, url))
+
+    async def close(self) -> int:
+        for _ in self._tasks:
+            await self._queue.put(None)
+        await asyncio.gather(*self._tasks)
+        return self.saved
+
+
+class CrawlCheckpoint:
+    """Opt-in resume state: opaque keys of pages already saved to ``output_dir``.
+
+    Only policy-derived references are persisted (never raw URLs), appended in
+    small fsync'd batches so an interrupted crawl loses at most one batch.
+    """
+
+    _FLUSH_EVERY = 32
+
+    def __init__(self, policy: CrawlerSecurityPolicy, output_dir: Path) -> None:
+        self.policy = policy
+        self.output_dir = output_dir
+        self.completed = policy.load_checkpoint(output_dir)
+        self._pending: list[str] = []
+
+    def remaining(self, urls: list[str]) -> list[str]:
+        key = self.policy.checkpoint_key
+        kept = [u for u in urls if key(u) not in self.completed]
+        if len(kept) < len(urls):
+            logger.info("Resuming: skipping %d saved page(s)", len(urls) - len(kept))
+        return kept
+
+    def mark(self, url: str) -> None:
+        key = self.policy.checkpoint_key(url)
+        self.completed.add(key)
+        self._pending.append(key)
+        if len(self._pending) >= self._FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        keys = self._pending[:]
+        self.policy.append_checkpoint(self.output_dir, keys)
+        del self._pending[: len(keys)]
+
+
 class KGIngestor:
     """Best-effort, bounded MCP ingestion of privacy-sanitized page content."""
 
@@ -386,6 +634,29 @@ class _CrawlResult:
     )
 
 
+async def _iter_completed(
+    run: Callable[[str], Awaitable[Any]],
+    urls: list[str],
+    window: int,
+) -> AsyncIterator[Any]:
+    """Yield ``run(url)`` results as they finish, keeping ``window`` in flight."""
+
+    queued = iter(urls)
+    pending = {asyncio.ensure_future(run(url)) for url in islice(queued, window)}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                for url in islice(queued, 1):
+                    pending.add(asyncio.ensure_future(run(url)))
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
 class SafeHttpCrawler:
     """Default crawler: bounded HTTP fetches with no browser execution surface."""
 
@@ -405,7 +676,9 @@ class SafeHttpCrawler:
     ) -> _CrawlResult:
         del config
         try:
-            normalized = self.policy.validate_url(url)
+            # fetch_text re-validates with DNS on the worker thread; resolving
+            # here as well would block the event loop on a duplicate lookup.
+            normalized = self.policy.validate_url(url, resolve_dns=False)
             async with self._semaphore:
                 html = await asyncio.to_thread(self.policy.fetch_text, normalized)
             parser = _HTMLTextExtractor()
@@ -438,8 +711,15 @@ class SafeHttpCrawler:
         urls: list[str],
         config: Any = None,
         dispatcher: Any = None,
-    ) -> list[_CrawlResult]:
+        stream: bool = False,
+    ) -> list[_CrawlResult] | AsyncIterator[Any]:
         del dispatcher
+        if stream:
+            return _iter_completed(
+                lambda url: self.arun(url=url, config=config),
+                urls,
+                self._batch_size,
+            )
         results: list[_CrawlResult] = []
         for offset in range(0, len(urls), self._batch_size):
             results.extend(
@@ -469,7 +749,7 @@ class GuardedBrowserCrawler:
 
     async def arun(self, *, url: str, config: Any = None, **kwargs: Any) -> Any:
         try:
-            normalized = self.policy.validate_url(url)
+            normalized = self.policy.validate_url(url, resolve_dns=False)
             # Central HTTP preflight validates DNS and every redirect before the
             # more privileged browser is allowed to navigate.
             await asyncio.to_thread(self.policy.fetch_bytes, normalized)
@@ -496,8 +776,15 @@ class GuardedBrowserCrawler:
         urls: list[str],
         config: Any = None,
         dispatcher: Any = None,
-    ) -> list[Any]:
+        stream: bool = False,
+    ) -> list[Any] | AsyncIterator[Any]:
         del dispatcher
+        if stream:
+            return _iter_completed(
+                lambda url: self.arun(url=url, config=config),
+                urls,
+                self._batch_size,
+            )
         results: list[Any] = []
         for offset in range(0, len(urls), self._batch_size):
             results.extend(
@@ -523,7 +810,7 @@ async def crawl_single(
     result = await crawler.arun(url=url, config=crawl_config)
     if result.success:
         md = extract_markdown(result, policy)
-        save_markdown(md, result.url, output_dir, policy)
+        await save_markdown(md, result.url, output_dir, policy)
         if kg_ingestor and md.strip():
             kg_ingestor.submit(result.url, md)
     else:
@@ -549,35 +836,30 @@ async def crawl_chunked(
         # The header-chunking below is a local file-splitting convenience; graph-os
         # ingests the whole cleaned page as one Document (it does its own chunking).
         kg_ingestor.submit(result.url, markdown)
-    header_pattern = re.compile(r"^(# .+|## .+)$", re.MULTILINE)
-    headers: list[int] = []
-    for match in header_pattern.finditer(markdown):
-        headers.append(match.start())
-        if len(headers) >= _MAX_CHUNKS_PER_PAGE - 1:
-            break
-    if not headers or headers[0] != 0:
-        headers.insert(0, 0)
-    headers.append(len(markdown))
-    chunks = []
-    for i in range(len(headers) - 1):
-        chunk = markdown[headers[i] : headers[i + 1]].strip()
-        if chunk:
-            chunks.append(chunk)
-
-    logger.info("Split content into %d chunk(s)", len(chunks))
-    for idx, chunk in enumerate(chunks):
-        save_markdown(
-            chunk,
-            result.url,
-            output_dir,
-            policy,
-            prefix=f"chunk-{idx + 1}",
-        )
-    if output_dir:
-        logger.info("Saved %d chunk(s)", len(chunks))
+    saved = await save_markdown_chunks(
+        iter_markdown_chunks(markdown), result.url, output_dir, policy
+    )
+    logger.info("Saved %d chunk(s)", saved)
+
+
+@lru_cache(maxsize=MAX_SITEMAP_URLS)
+def _url_path(url: str) -> str:
+    """Return the URL path; memoized because scope filters revisit URLs."""
+
+    return urlsplit(url).path
+
 
+def filter_by_path_prefix(urls: list[str], prefixes: list[str]) -> list[str]:
+    """Keep URLs whose path starts with any prefix, in one C-level check each."""
 
-def fetch_sitemap_urls(
+    logger.info("Filtering sitemap URLs by configured path scope")
+    scope = tuple(prefixes)
+    kept = [u for u in urls if _url_path(u).startswith(scope)]
+    logger.info(f"Filtered {len(urls)} URLs down to {len(kept)}")
+    return kept
+
+
+async def fetch_sitemap_urls(
     sitemap_url: str,
     policy: CrawlerSecurityPolicy,
     *,
@@ -585,15 +867,26 @@ def fetch_sitemap_urls(
     _depth: int = 0,
     _visited: set[str] | None = None,
     _allowed_origins: set[str] | None = None,
+    _semaphore: asyncio.Semaphore | None = None,
+    probed: dict[str, bytes] | None = None,
 ) -> list[str]:
-    """Fetch bounded sitemap XML while retaining the seed origin boundary."""
+    """Fetch bounded sitemap XML while retaining the seed origin boundary.
+
+    Child sitemaps of an index are fetched concurrently in small waves (each
+    fetch runs on a worker thread, gated by one shared semaphore) and the walk
+    stops as soon as ``max_urls`` page URLs have been collected. A body that
+    ``discover_sitemap`` already downloaded is taken (and removed) from
+    ``probed`` instead of being fetched again.
+    """
 
     max_urls = max(1, min(int(max_urls), MAX_SITEMAP_URLS))
     if _depth > MAX_SITEMAP_DEPTH:
         return []
     visited = _visited if _visited is not None else set()
+    semaphore = _semaphore or asyncio.Semaphore(_SITEMAP_FETCH_CONCURRENCY)
     try:
-        normalized = policy.validate_url(sitemap_url)
+        # Syntax and scope only: fetch_bytes resolves and checks DNS itself.
+        normalized = policy.validate_url(sitemap_url, resolve_dns=False)
         if normalized in visited or len(visited) >= MAX_SITEMAP_URLS:
             return []
         visited.add(normalized)
@@ -601,46 +894,60 @@ def fetch_sitemap_urls(
         normalized = policy.require_scoped_url(
             normalized,
             allowed_origins=origins,
+            resolve_dns=False,
         )
-        body = policy.fetch_bytes(normalized, max_bytes=MAX_SITEMAP_BYTES)
-        root = parse_bounded_sitemap_xml(body)
-        namespace = {"ns": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+        body = probed.pop(normalized, None) if probed else None
+        if body is None:
+            async with semaphore:
+                body = await asyncio.to_thread(
+                    policy.fetch_bytes, normalized, max_bytes=MAX_SITEMAP_BYTES
+                )
+        child_sitemaps, page_urls = parse_bounded_sitemap_xml(body)
+        del body
 
         # Sitemap index: recursively fetch child sitemaps
-        child_sitemaps = root.findall(".//ns:sitemap/ns:loc", namespace)
         if child_sitemaps:
-            all_urls: list[str] = []
+            child_urls: list[str] = []
             for child_loc in child_sitemaps[:max_urls]:
-                if not child_loc.text:
-                    continue
                 try:
-                    child_url = policy.require_scoped_url(
-                        child_loc.text,
-                        allowed_origins=origins,
-                        resolve_dns=False,
+                    child_urls.append(
+                        policy.require_scoped_url(
+                            child_loc,
+                            allowed_origins=origins,
+                            resolve_dns=False,
+                        )
                     )
                 except CrawlerSecurityError:
                     continue
-                child_urls = fetch_sitemap_urls(
-                    child_url,
-                    policy,
-                    max_urls=max_urls - len(all_urls),
-                    _depth=_depth + 1,
-                    _visited=visited,
-                    _allowed_origins=origins,
+            all_urls: list[str] = []
+            for offset in range(0, len(child_urls), _SITEMAP_FETCH_CONCURRENCY):
+                wave = await asyncio.gather(
+                    *(
+                        fetch_sitemap_urls(
+                            child_url,
+                            policy,
+                            max_urls=max_urls - len(all_urls),
+                            _depth=_depth + 1,
+                            _visited=visited,
+                            _allowed_origins=origins,
+                            _semaphore=semaphore,
+                        )
+                        for child_url in child_urls[
+                            offset : offset + _SITEMAP_FETCH_CONCURRENCY
+                        ]
+                    )
                 )
-                all_urls.extend(child_urls)
+                for urls in wave:
+                    all_urls.extend(urls)
                 if len(all_urls) >= max_urls:
                     break
             return list(dict.fromkeys(all_urls))[:max_urls]
 
         urls: list[str] = []
-        for loc in root.findall(".//ns:url/ns:loc", namespace)[:max_urls]:
-            if not loc.text:
-                continue
+        for loc in page_urls[:max_urls]:
             try:
                 candidate = policy.require_scoped_url(
-                    loc.text,
+                    loc,
                     allowed_origins=origins,
                     resolve_dns=False,
                 )
@@ -656,14 +963,20 @@ def fetch_sitemap_urls(
 def discover_sitemap(
     start_url: str,
     policy: CrawlerSecurityPolicy,
+    probed: dict[str, bytes] | None = None,
 ) -> str | None:
-    """Check bounded robots.txt and sitemap.xml inside the seed trust scope."""
+    """Check bounded robots.txt and sitemap.xml inside the seed trust scope.
+
+    When the ``sitemap.xml`` probe succeeds its body is stored in ``probed``
+    under the returned URL so the crawl can reuse it.
+    """
 
+    # Seeds were DNS-validated in main(); every fetch below re-validates.
     try:
-        normalized = policy.validate_url(start_url)
+        normalized = policy.validate_url(start_url, resolve_dns=False)
     except Exception:
         return None
-    parsed = urlparse(normalized)
+    parsed = urlsplit(normalized)
     base_url = f"{parsed.scheme}://{parsed.netloc}"
     origins = {policy.origin(normalized)}
     robots_url = f"{base_url}/robots.txt"
@@ -674,13 +987,19 @@ def discover_sitemap(
                 return policy.require_scoped_url(
                     line.split(":", 1)[1].strip(),
                     allowed_origins=origins,
+                    resolve_dns=False,
                 )
     except Exception:
         pass
     candidate = f"{base_url}/sitemap.xml"
     try:
-        policy.fetch_bytes(candidate, max_bytes=MAX_SITEMAP_BYTES)
-        return policy.require_scoped_url(candidate, allowed_origins=origins)
+        body = policy.fetch_bytes(candidate, max_bytes=MAX_SITEMAP_BYTES)
+        scoped = policy.require_scoped_url(
+            candidate, allowed_origins=origins, resolve_dns=False
+        )
+        if probed is not None:
+            probed[scoped] = body
+        return scoped
     except Exception:
         pass
     return None
@@ -696,21 +1015,20 @@ async def crawl_sitemap_sequential(
     allowed_prefixes: list[str] | None = None,
     kg_ingestor=None,
     seen_fingerprints: set | None = None,
+    checkpoint: CrawlCheckpoint | None = None,
+    probed_sitemaps: dict[str, bytes] | None = None,
 ):
-    urls = fetch_sitemap_urls(sitemap_url, policy, max_urls=max_pages)
+    urls = await fetch_sitemap_urls(
+        sitemap_url, policy, max_urls=max_pages, probed=probed_sitemaps
+    )
     if not urls:
         logger.warning("No URLs found in sitemap.")
         return 0
 
     if allowed_prefixes:
-        logger.info("Filtering sitemap URLs by configured path scope")
-        original_count = len(urls)
-        urls = [
-            u
-            for u in urls
-            if any(urlparse(u).path.startswith(p) for p in allowed_prefixes)
-        ]
-        logger.info(f"Filtered {original_count} URLs down to {len(urls)}")
+        urls = filter_by_path_prefix(urls, allowed_prefixes)
+    if checkpoint:
+        urls = checkpoint.remaining(urls)
 
     if not urls:
         logger.warning("No URLs remaining after filtering.")
@@ -730,7 +1048,11 @@ async def crawl_sitemap_sequential(
                 logger.info("Skipping near-duplicate page")
                 continue
             logger.info("Page crawl succeeded")
-            save_markdown(md, result.url, output_dir, policy)
+            if await save_markdown(md, result.url, output_dir, policy) and checkpoint:
+                try:
+                    checkpoint.mark(result.url)
+                except CrawlerSecurityError:
+                    logger.warning("Could not record crawl checkpoint")
             if kg_ingestor:
                 kg_ingestor.submit(result.url, md)
         else:
@@ -744,28 +1066,25 @@ async def crawl_sitemap_parallel(
     crawl_config,
     dispatcher,
     output_dir: Path | None,
-    process,
-    peak_memory,
     policy: CrawlerSecurityPolicy,
     max_pages: int,
     allowed_prefixes: list[str] | None = None,
     kg_ingestor=None,
     seen_fingerprints: set | None = None,
+    checkpoint: CrawlCheckpoint | None = None,
+    probed_sitemaps: dict[str, bytes] | None = None,
 ):
-    urls = fetch_sitemap_urls(sitemap_url, policy, max_urls=max_pages)
+    urls = await fetch_sitemap_urls(
+        sitemap_url, policy, max_urls=max_pages, probed=probed_sitemaps
+    )
     if not urls:
         logger.warning("No URLs found in sitemap.")
         return 0
 
     if allowed_prefixes:
-        logger.info("Filtering sitemap URLs by configured path scope")
-        original_count = len(urls)
-        urls = [
-            u
-            for u in urls
-            if any(urlparse(u).path.startswith(p) for p in allowed_prefixes)
-        ]
-        logger.info(f"Filtered {original_count} URLs down to {len(urls)}")
+        urls = filter_by_path_prefix(urls, allowed_prefixes)
+    if checkpoint:
+        urls = checkpoint.remaining(urls)
 
     if not urls:
         logger.warning("No URLs remaining after filtering.")
@@ -773,42 +1092,54 @@ async def crawl_sitemap_parallel(
 
     logger.info(f"Found {len(urls)} URLs to crawl in parallel.")
 
-    log_memory(process, peak_memory, "Before crawl:")
+    log_memory("Before crawl:")
+    # Stream results so each page is extracted, queued for writing, and
+    # released as it completes instead of holding the whole sitemap in memory.
     results = await crawler.arun_many(
-        urls=urls, config=crawl_config, dispatcher=dispatcher
+        urls=urls, config=crawl_config, dispatcher=dispatcher, stream=True
     )
 
     seen = seen_fingerprints if seen_fingerprints is not None else set()
     success_count = 0
     fail_count = 0
     duplicate_count = 0
-    for result in results:
-        if result.success:
-            md = extract_markdown(result, policy)
-            if not md.strip():
+    writers = _MarkdownWriterPool(
+        output_dir, policy, on_saved=checkpoint.mark if checkpoint else None
+    )
+    try:
+        async for result in results:
+            if result.success:
+                md = extract_markdown(result, policy)
+                if not md.strip():
+                    fail_count += 1
+                    continue
+                if is_duplicate_content(md, seen):
+                    duplicate_count += 1
+                    logger.info("Skipping near-duplicate page")
+                    continue
+                success_count += 1
+                await writers.put(md, result.url)
+                if kg_ingestor:
+                    kg_ingestor.submit(result.url, md)
+            else:
+                logger.error("Crawl failed; upstream details omitted")
                 fail_count += 1
-                continue
-            if is_duplicate_content(md, seen):
-                duplicate_count += 1
-                logger.info("Skipping near-duplicate page")
-                continue
-            success_count += 1
-            save_markdown(md, result.url, output_dir, policy)
-            if kg_ingestor:
-                kg_ingestor.submit(result.url, md)
-        else:
-            logger.error("Crawl failed; upstream details omitted")
-            fail_count += 1
+    finally:
+        saved_count = await writers.close()
 
     logger.info("\nSummary:")
     logger.info(f"  - Successfully crawled: {success_count}")
     logger.info(f"  - Duplicates skipped: {duplicate_count}")
     logger.info(f"  - Failed: {fail_count}")
-    log_memory(process, peak_memory, "After crawl:")
+    logger.info(f"  - Saved: {saved_count}")
+    log_memory("After crawl:")
     return len(urls)
 
 
 def normalize_url(url):
+    # Most harvested links carry no fragment; skip the split entirely for them.
+    if "#" not in url:
+        return url
     return urldefrag(url)[0]
 
 
@@ -826,23 +1157,29 @@ async def crawl_recursive_high_speed(
 ):
     seen_fingerprints: set = set()
     duplicate_count = 0
-    visited = set()
-    current_urls = {policy.validate_url(normalize_url(u)) for u in start_urls}
-    allowed_origins = {policy.origin(u) for u in current_urls}
+    visited: set[str] = set()
+    visited_add = visited.add
+    current_urls = {
+        policy.validate_url(normalize_url(u), resolve_dns=False) for u in start_urls
+    }
+    allowed_origins = frozenset(policy.origin(u) for u in current_urls)
+    origin_of = policy.origin
+    require_scoped = policy.require_scoped_url
 
     # Compute the common path prefix across start URLs to stay focused.
     # E.g. for "/docs/r/api-reference/foo.html" the prefix becomes "/docs/".
     # We take the first two path segments (e.g. "/docs/") so sub-pages are included.
     def _path_prefix(url):
-        parts = urlparse(url).path.strip("/").split("/")
+        parts = _url_path(url).strip("/").split("/")
         # Use first segment only (e.g. "docs") as the scope boundary
         return "/" + parts[0] + "/" if parts and parts[0] else "/"
 
-    allowed_prefixes = {_path_prefix(u) for u in start_urls}
+    # A tuple lets ``str.startswith`` test every prefix in a single C call.
+    allowed_prefixes = tuple({_path_prefix(u) for u in start_urls})
     logger.info("Restricting recursive crawl to configured origin and path scope")
 
     total_saved = 0
-    ignore_prefix = ignore_prefix_restriction
+    scope_prefixes = () if ignore_prefix_restriction else allowed_prefixes
 
     for depth in range(max_depth):
         if len(visited) >= max_pages:
@@ -850,11 +1187,11 @@ async def crawl_recursive_high_speed(
             break
         logger.info("Crawling depth %d with %d URL(s)", depth + 1, len(current_urls))
 
-        urls_to_crawl = []
-        for u in current_urls:
-            if u not in visited:
-                if policy.origin(u) in allowed_origins:
-                    urls_to_crawl.append(u)
+        urls_to_crawl = [
+            u
+            for u in current_urls
+            if u not in visited and origin_of(u) in allowed_origins
+        ]
 
         if not urls_to_crawl:
             break
@@ -868,38 +1205,40 @@ async def crawl_recursive_high_speed(
         )
 
         next_level_urls = set()
+        # Never hold more frontier than the remaining page budget can visit.
+        frontier_cap = max(0, max_pages - len(visited))
+        pending_saves: list[tuple[str, str]] = []
         for result in results:
             try:
-                norm_url = policy.require_scoped_url(
+                # The crawler wrappers already DNS-checked this URL (the browser
+                # wrapper after navigation); only the scope is re-asserted here.
+                norm_url = require_scoped(
                     normalize_url(result.url),
                     allowed_origins=allowed_origins,
+                    resolve_dns=False,
                 )
             except CrawlerSecurityError:
                 logger.error("Crawl result violated the configured origin policy")
                 continue
-            visited.add(norm_url)
+            visited_add(norm_url)
 
             if result.success:
                 md = extract_markdown(result, policy)
 
                 # Filter out access-denied pages
-                if (
-                    md
-                    and "Access Denied" not in md
-                    and "permission to access" not in md
-                ):
+                if md and not _BLOCKED_RE.search(md):
                     if is_duplicate_content(md, seen_fingerprints):
                         duplicate_count += 1
                         logger.info("Skipping near-duplicate page")
-                    elif save_markdown(md, norm_url, output_dir, policy):
-                        total_saved += 1
-                        if kg_ingestor:
-                            kg_ingestor.submit(norm_url, md)
+                    else:
+                        pending_saves.append((md, norm_url))
                 else:
                     logger.warning(
                         "Skipping URL because access was denied or content was blocked"
                     )
 
+                if len(next_level_urls) >= frontier_cap:
+                    continue
                 # Collect internal links for next depth, resolving relative hrefs
                 links = result.links.get("internal", [])[:MAX_LINKS_PER_PAGE]
                 logger.info("Found %d bounded internal link(s)", len(links))
@@ -911,31 +1250,43 @@ async def crawl_recursive_high_speed(
                     if not href.startswith(("http://", "https://")):
                         href = urljoin(norm_url, href)
                     try:
-                        next_url = policy.require_scoped_url(
+                        next_url = require_scoped(
                             normalize_url(href),
                             allowed_origins=allowed_origins,
                             resolve_dns=False,
                         )
                     except CrawlerSecurityError:
                         continue
-                    if next_url not in visited:
-                        next_level_urls.add(next_url)
+                    if next_url in visited:
+                        continue
+                    # Enforce the path scope while harvesting so out-of-scope
+                    # links never enter the frontier.
+                    if scope_prefixes and not _url_path(next_url).startswith(
+                        scope_prefixes
+                    ):
+                        continue
+                    next_level_urls.add(next_url)
+                    if len(next_level_urls) >= frontier_cap:
+                        break
             else:
                 logger.error("Crawl failed; upstream details omitted")
 
-        # Filter internal links to allowed prefixes (fixes the dead code)
-        if not ignore_prefix and allowed_prefixes and next_level_urls:
-            next_level_urls = {
-                u
-                for u in next_level_urls
-                if any(urlparse(u).path.startswith(p) for p in allowed_prefixes)
-            }
+        # Dedup stays sequential above; the depth's writes then overlap.
+        saved_flags = await asyncio.gather(
+            *(save_markdown(md, url, output_dir, policy) for md, url in pending_saves)
+        )
+        for (md, url), saved in zip(pending_saves, saved_flags, strict=True):
+            if saved:
+                total_saved += 1
+                if kg_ingestor:
+                    kg_ingestor.submit(url, md)
+        del pending_saves
 
         logger.info(
             "Extracted %d bounded unique link(s) for the next depth",
             len(next_level_urls),
         )
-        current_urls = set(list(next_level_urls)[:max_pages])
+        current_urls = next_level_urls
 
     logger.info(
         f"Crawl complete. Total files saved: {total_saved} "
@@ -1026,6 +1377,12 @@ async def main():
         default="",
         help="graph-os gateway base URL for KG ingestion (else $GRAPH_OS_URL).",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip sitemap pages already saved to --output-dir by an earlier "
+        "interrupted run (checkpoint stores opaque keys, not URLs).",
+    )
 
     args = parser.parse_args()
 
@@ -1051,6 +1408,9 @@ async def main():
             args.wait_for = "css:" + selector.removeprefix("css:")
         args.urls = [policy.validate_url(url) for url in args.urls][: args.max_pages]
         output_dir = policy.resolve_output_dir(args.output_dir)
+        if args.resume and output_dir is None:
+            raise CrawlerSecurityError("crawler_resume_requires_output_dir")
+        checkpoint = CrawlCheckpoint(policy, output_dir) if args.resume else None
     except Exception:
         logger.error("Crawler configuration was rejected by the security policy")
         return
@@ -1058,9 +1418,10 @@ async def main():
     # Auto-discovery of sitemap
     original_seed_urls = list(args.urls)
     discovered_sitemap = None
+    probed_sitemaps: dict[str, bytes] = {}
     if not args.no_sitemap:
         for url in args.urls:
-            sitemap = discover_sitemap(url, policy)
+            sitemap = discover_sitemap(url, policy, probed_sitemaps)
             if sitemap:
                 logger.info("Auto-discovered an approved sitemap")
                 if args.strategy == "recursive":
@@ -1071,13 +1432,16 @@ async def main():
                 discovered_sitemap = sitemap
                 args.urls = [sitemap]  # Update args.urls with the discovered sitemap
                 break  # Stop after finding the first sitemap
+    if not args.strategy.startswith("sitemap-"):
+        # Only sitemap strategies consume the probed body; don't hold it all crawl.
+        probed_sitemaps.clear()
 
     # Determine allowed prefixes for filtering (only if we auto-discovered a sitemap)
     allowed_prefixes = None
     if discovered_sitemap and not args.ignore_prefix_restriction:
 
         def _path_prefix(url):
-            parsed = urlparse(url)
+            parsed = urlsplit(url)
             path = parsed.path
             if not path or path == "/":
                 return "/"
@@ -1089,12 +1453,6 @@ async def main():
 
         allowed_prefixes = [_path_prefix(u) for u in original_seed_urls]
 
-    try:
-        process = psutil.Process(os.getpid()) if psutil is not None else None
-    except Exception:
-        process = None
-    peak_memory = [0]
-
     browser_config = None
     MAGIC_JS = """
     (async () => {
@@ -1172,9 +1530,7 @@ async def main():
             let html = document.querySelector('html');
             if (html) html.setAttribute('style', 'overflow: scroll; overflow-x: scroll;');
         } catch(e) {}
-
-        // Final wait to ensure content stabilizes
-        await new Promise(r => setTimeout(r, 2000));
+        // No trailing sleep: wait_for and delay_before_return_html gate capture.
     })();
     """
 
@@ -1301,6 +1657,8 @@ async def main():
                     allowed_prefixes=scoped_prefixes,
                     kg_ingestor=kg_ingestor,
                     seen_fingerprints=seen_fingerprints,
+                    checkpoint=checkpoint,
+                    probed_sitemaps=probed_sitemaps,
                 )
                 remaining -= attempted
         elif args.strategy == "sitemap-parallel":
@@ -1314,16 +1672,19 @@ async def main():
                     crawl_config,
                     dispatcher,
                     output_dir,
-                    process,
-                    peak_memory,
                     policy,
                     remaining,
                     allowed_prefixes=scoped_prefixes,
                     kg_ingestor=kg_ingestor,
                     seen_fingerprints=seen_fingerprints,
+                    checkpoint=checkpoint,
+                    probed_sitemaps=probed_sitemaps,
                 )
                 remaining -= attempted
         elif args.strategy == "recursive":
+            if checkpoint:
+                # Skipping saved pages would also drop their outgoing links.
+                logger.warning("--resume applies to sitemap strategies only")
             await crawl_recursive_high_speed(
                 crawler,
                 args.urls,
@@ -1351,6 +1712,12 @@ async def main():
                 await run_selected_strategy(crawler)
     except Exception:
         logger.error("Crawler execution failed")
+    finally:
+        if checkpoint:
+            try:
+                checkpoint.flush()
+            except CrawlerSecurityError:
+                logger.error("Crawler checkpoint could not be written")
 
     if kg_ingestor:
         logger.info(kg_ingestor.summary())
@@ -12,6 +12,7 @@ import json
 import os
 import re
 import secrets
+import stat
 import threading
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -46,9 +47,12 @@ MAX_TOKEN_BYTES = 16 * 1024
 MAX_TIMEOUT_SECONDS = 120.0
 MAX_TOTAL_OUTPUT_BYTES = 512 * 1024 * 1024
 MAX_TOTAL_OUTPUT_FILES = 5_000
+MAX_CHECKPOINT_BYTES = 1024 * 1024
+CHECKPOINT_FILENAME = ".crawl-checkpoint"
 
 _SESSION_ID_RE = re.compile(r"^[A-Za-z0-9._~-]{1,256}$")
 _BROWSER_HOST_RE = re.compile(r"^(?:[A-Za-z0-9](?:[A-Za-z0-9.-]{0,251}[A-Za-z0-9])?)$")
+_SUFFIX_SCRUB_RE = re.compile(r"[^a-z0-9-]+")
 
 
 class CrawlerSecurityError(ValueError):
@@ -85,31 +89,67 @@ def _is_relative_to(path: Path, root: Path) -> bool:
     return True
 
 
+def _write_all(descriptor: int, payload: bytes) -> None:
+    """Write ``payload`` straight to ``descriptor``, bypassing the io stack."""
+
+    view = memoryview(payload)
+    while view:
+        view = view[os.write(descriptor, view) :]
+
+
+def _open_regular_file(path: Path, flags: int, error: str, mode: int = 0o600) -> int:
+    """Open ``path`` without following symlinks or blocking on FIFOs/devices.
+
+    Anything but a regular file is closed again and rejected with ``error``.
+    """
+
+    flags |= getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_NONBLOCK", 0)
+    descriptor = os.open(path, flags, mode)
+    try:
+        if not stat.S_ISREG(os.fstat(descriptor).st_mode):
+            raise CrawlerSecurityError(error)
+    except BaseException:
+        os.close(descriptor)
+        raise
+    return descriptor
+
+
+def _make_private_directory(path: Path) -> None:
+    path.mkdir(mode=0o700, exist_ok=True)
+    try:
+        path.chmod(0o700)
+    except OSError:
+        pass
+
+
 def _ensure_private_directory(path: Path, root: Path) -> Path:
-    """Create a confined directory without traversing an in-scope symlink."""
+    """Create a confined directory without traversing an in-scope symlink.
 
-    root_existed = root.exists()
-    root.mkdir(mode=0o700, parents=True, exist_ok=True)
-    if not root_existed:
-        try:
-            root.chmod(0o700)
-        except OSError:
-            pass
-    if root.is_symlink():
+    This runs before every write, so existing components cost one ``lstat``
+    each; ``mkdir`` and ``chmod`` only run for components that are missing.
+    """
+
+    try:
+        root_mode = root.lstat().st_mode
+    except FileNotFoundError:
+        root.parent.mkdir(parents=True, exist_ok=True)
+        _make_private_directory(root)
+        root_mode = root.lstat().st_mode
+    if stat.S_ISLNK(root_mode):
         raise CrawlerSecurityError("crawler_output_root_symlink")
 
     current = root
     for part in path.relative_to(root).parts:
         current = current / part
-        if current.exists() and current.is_symlink():
+        try:
+            mode = current.lstat().st_mode
+        except FileNotFoundError:
+            _make_private_directory(current)
+            continue
+        if stat.S_ISLNK(mode):
             raise CrawlerSecurityError("crawler_output_symlink")
-        existed = current.exists()
-        current.mkdir(mode=0o700, exist_ok=True)
-        if not existed:
-            try:
-                current.chmod(0o700)
-            except OSError:
-                pass
+        if not stat.S_ISDIR(mode):
+            raise CrawlerSecurityError("crawler_output_not_directory")
     return path
 
 
@@ -347,10 +387,12 @@ class CrawlerSecurityPolicy:
         output_dir = self.require_output_dir(output_dir)
         clean = self.reserve_output(content)
         source_ref = self.source_reference(source_url).rsplit("_", 1)[-1][:20]
-        safe_suffix = re.sub(r"[^a-z0-9-]+", "-", suffix.casefold()).strip("-")[:32]
+        safe_suffix = _SUFFIX_SCRUB_RE.sub("-", suffix.casefold()).strip("-")[:32]
         filename = f"page-{source_ref}{('-' + safe_suffix) if safe_suffix else ''}.md"
         target = output_dir / filename
-        if target.exists() and target.is_symlink():
+        # ``is_symlink`` is a single lstat and, unlike ``exists``, also catches
+        # dangling links planted at the target name.
+        if target.is_symlink():
             raise CrawlerSecurityError("crawler_output_symlink")
         temporary = output_dir / f".crawler-{secrets.token_hex(12)}.tmp"
         flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
@@ -359,19 +401,14 @@ class CrawlerSecurityPolicy:
         descriptor = None
         try:
             descriptor = os.open(temporary, flags, 0o600)
-            payload = clean.encode("utf-8")
-            with os.fdopen(descriptor, "wb", closefd=True) as handle:
-                descriptor = None
-                handle.write(payload)
-                handle.flush()
-                os.fsync(handle.fileno())
-            if target.exists() and target.is_symlink():
+            _write_all(descriptor, clean.encode("utf-8"))
+            os.fsync(descriptor)
+            descriptor, written = None, descriptor
+            os.close(written)
+            if target.is_symlink():
                 raise CrawlerSecurityError("crawler_output_symlink")
+            # The temporary file was created 0600; ``os.replace`` keeps its mode.
             os.replace(temporary, target)
-            try:
-                target.chmod(0o600)
-            except OSError:
-                pass
             return True
         except CrawlerSecurityError:
             raise
@@ -385,6 +422,53 @@ class CrawlerSecurityPolicy:
             except OSError:
                 pass
 
+    def checkpoint_key(self, url: str) -> str:
+        """Opaque, stable key recording a completed page without its URL."""
+
+        return persistence_reference(
+            "crawl_checkpoint", self.validate_url(url, resolve_dns=False)
+        )
+
+    def load_checkpoint(self, output_dir: Path) -> set[str]:
+        """Read completed-page keys from a private, non-symlink checkpoint."""
+
+        path = self.require_output_dir(output_dir) / CHECKPOINT_FILENAME
+        try:
+            descriptor = _open_regular_file(
+                path, os.O_RDONLY, "crawler_checkpoint_unreadable"
+            )
+        except FileNotFoundError:
+            return set()
+        except OSError:
+            raise CrawlerSecurityError("crawler_checkpoint_unreadable") from None
+        with os.fdopen(descriptor, "rb") as handle:
+            data = handle.read(MAX_CHECKPOINT_BYTES + 1)
+        if len(data) > MAX_CHECKPOINT_BYTES:
+            raise CrawlerSecurityError("crawler_checkpoint_too_large")
+        return set(data.decode("utf-8", errors="ignore").split())
+
+    def append_checkpoint(self, output_dir: Path, keys: list[str]) -> None:
+        """Durably append completed-page keys (0600, never through a symlink)."""
+
+        if not keys:
+            return
+        path = self.require_output_dir(output_dir) / CHECKPOINT_FILENAME
+        try:
+            descriptor = _open_regular_file(
+                path,
+                os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                "crawler_checkpoint_unwritable",
+            )
+        except OSError:
+            raise CrawlerSecurityError("crawler_checkpoint_unwritable") from None
+        try:
+            _write_all(descriptor, "".join(f"{key}\n" for key in keys).encode("utf-8"))
+            os.fsync(descriptor)
+        except OSError:
+            raise CrawlerSecurityError("crawler_checkpoint_unwritable") from None
+        finally:
+            os.close(descriptor)
+
 
 class SafeMCPClient:
     """Bounded MCP streamable-HTTP client using the shared graph-os TLS profile."""
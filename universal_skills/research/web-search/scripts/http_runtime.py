@@ -7,13 +7,197 @@ provider scripts must not add their own ``verify=False`` switches.
 
 from __future__ import annotations
 
+import importlib.util
 import json
-from typing import Any
+import random
+import sys
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from itertools import islice
+from typing import Any, TypeVar
 
-from agent_utilities.core.config import AgentConfig
-from agent_utilities.protocols.source_connectors.http_safety import safe_get_bytes
+# agent-utilities is required but heavy to import; check it is installed now
+# (so provider scripts still fail fast with their install hint) and defer the
+# import itself until the first request, keeping ``--help`` and argument
+# errors cheap.
+if importlib.util.find_spec("agent_utilities") is None:
+    raise ImportError("agent_utilities is required by the web-search skill")
+
+try:  # Optional C decoder; the stdlib parser is the always-available fallback.
+    import orjson
+except ImportError:
+    orjson = None
 
 _SEARCH_RESPONSE_LIMIT = 4 * 1024 * 1024
+_SEARCH_RETRIES = 2
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 8.0
+_BATCH_CONCURRENCY = 8
+_GZIP_MAGIC = b"\x1f\x8b"
+# Output shape shared by every provider: one dict per hit with these keys.
+RESULT_FIELDS = ("title", "link", "snippet")
+# Headers for JSON APIs that honour content negotiation; gzip shrinks the
+# verbose result payloads several-fold on the wire.
+JSON_ACCEPT_HEADERS = {"Accept": "application/json", "Accept-Encoding": "gzip"}
+
+_T = TypeVar("_T")
+
+
+class _TokenBucket:
+    """Thread-safe token bucket pacing outbound provider requests."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            wait = (1.0 - self._tokens) / self.rate if self._tokens < 1.0 else 0.0
+            # Claim the token now (possibly going negative) so concurrent
+            # callers queue behind each other instead of all waking at once.
+            self._tokens -= 1.0
+        if wait:
+            time.sleep(wait)
+
+
+_RATE_LIMIT = _TokenBucket(rate=5.0, capacity=5)
+
+
+def _http_safety(name: str) -> Any:
+    """Return ``SourceEgressError``/``safe_get_bytes``, importing them on first use."""
+
+    value = globals().get(name)
+    if value is None:
+        from agent_utilities.protocols.source_connectors import http_safety
+
+        value = globals()[name] = getattr(http_safety, name)
+    return value
+
+
+def __getattr__(name: str) -> Any:
+    if name in ("SourceEgressError", "safe_get_bytes"):
+        return _http_safety(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Retry throttling, server errors, and transport failures, never denials."""
+
+    response = getattr(exc, "response", None)
+    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    if isinstance(exc, _http_safety("SourceEgressError")):
+        return False
+    # Transport failures only (OSError covers timeouts and requests' errors);
+    # anything else is a bug to surface at once. httpx errors can only occur
+    # once the transport has imported httpx, so it is never imported here.
+    if isinstance(exc, OSError):
+        return True
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(exc, httpx.TransportError)
+
+
+def _retry_delay(exc: Exception, attempt: int) -> float:
+    """Honour a numeric ``Retry-After``; otherwise back off exponentially with jitter.
+
+    The jitter (50-100% of the exponential step) keeps concurrent callers that
+    failed together from retrying in lockstep.
+    """
+
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        retry_after = float(headers.get("Retry-After", ""))
+    except (TypeError, ValueError):
+        retry_after = None
+    if retry_after is not None and retry_after >= 0:
+        return min(_RETRY_MAX_DELAY, retry_after)
+    step = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2**attempt)
+    return step * random.uniform(0.5, 1.0)
+
+
+@lru_cache(maxsize=1)
+def _egress_limits() -> dict[str, Any]:
+    """Resolve the AgentConfig egress limits once per process.
+
+    The connection, TLS, and proxy handling itself stays inside
+    ``safe_get_bytes``; only the configuration load is shared across calls.
+    """
+
+    from agent_utilities.core.config import AgentConfig
+
+    cfg = AgentConfig()
+    return {
+        "timeout": 30.0,
+        "max_bytes": min(cfg.source_http_max_response_bytes, _SEARCH_RESPONSE_LIMIT),
+        "max_redirects": cfg.source_http_max_redirects,
+        "allowed_private_hosts": cfg.source_http_allowed_private_hosts,
+        "allowed_redirect_hosts": cfg.source_http_allowed_redirect_hosts,
+    }
+
+
+def _gunzip(body: bytes) -> bytes:
+    """Inflate a gzip body the transport left encoded, within the response cap."""
+
+    if not body.startswith(_GZIP_MAGIC):
+        return body
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    plain = inflater.decompress(body, _SEARCH_RESPONSE_LIMIT)
+    if inflater.unconsumed_tail:
+        raise ValueError("Search provider response exceeds the size limit")
+    return plain
+
+
+def fetch_bytes(
+    url: str,
+    *,
+    params: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+) -> tuple[bytes, str | None]:
+    """Fetch one bounded response body and its declared charset.
+
+    A gzip body is inflated here if the transport did not already decode it,
+    so callers may send ``Accept-Encoding: gzip`` without caring which.
+
+    Requests are paced by a process-wide token bucket, and throttling (429),
+    server errors, and transport failures are retried with jittered exponential
+    backoff (or after the server's ``Retry-After``, capped).
+    Policy denials and malformed input are never retried.
+    """
+
+    attempt = 0
+    while True:
+        _RATE_LIMIT.acquire()
+        try:
+            body, encoding = _http_safety("safe_get_bytes")(
+                url, params=params, headers=headers, **_egress_limits()
+            )
+            break
+        except Exception as exc:
+            if attempt >= _SEARCH_RETRIES or not _is_transient(exc):
+                raise
+            time.sleep(_retry_delay(exc, attempt))
+            attempt += 1
+    return _gunzip(body), encoding
+
+
+def is_utf8_charset(encoding: str | None) -> bool:
+    """True for a missing charset (JSON's default) or any spelling of UTF-8."""
+
+    return not encoding or encoding.casefold().replace("_", "-") in ("utf-8", "utf8")
 
 
 def fetch_json(
@@ -24,23 +208,70 @@ def fetch_json(
 ) -> dict[str, Any]:
     """Fetch and decode one bounded JSON object through the shared egress policy."""
 
-    cfg = AgentConfig()
-    body, encoding = safe_get_bytes(
-        url,
-        params=params,
-        headers=headers,
-        timeout=30.0,
-        max_bytes=min(cfg.source_http_max_response_bytes, _SEARCH_RESPONSE_LIMIT),
-        max_redirects=cfg.source_http_max_redirects,
-        allowed_private_hosts=cfg.source_http_allowed_private_hosts,
-        allowed_redirect_hosts=cfg.source_http_allowed_redirect_hosts,
-    )
-    decoded = json.loads(body.decode(encoding or "utf-8"))
+    return decode_json(*fetch_bytes(url, params=params, headers=headers))
+
+
+def decode_json(body: bytes, encoding: str | None = None) -> dict[str, Any]:
+    """Decode one JSON object body, rejecting any other top-level shape."""
+
+    # Both parsers read UTF-8 bytes directly; only transcode other charsets.
+    payload = body if is_utf8_charset(encoding) else body.decode(encoding)
+    decoded = orjson.loads(payload) if orjson is not None else json.loads(payload)
     if not isinstance(decoded, dict):
         raise ValueError("Search provider returned an invalid JSON shape")
     return decoded
 
 
+# Listing template for one hit, applied with ``str.format_map``.
+_RESULT_FMT = "\n{i}. {title}\n   URL: {link}\n   Snippet: {snippet}\n"
+
+
+class _ResultRow(dict):
+    """Format mapping that renders an absent field as ``None``, like ``dict.get``."""
+
+    def __missing__(self, key: str) -> None:
+        return None
+
+
+def project_results(
+    items: Iterable[dict[str, Any]],
+    source_fields: tuple[str, str, str],
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """Map up to ``limit`` provider items onto ``RESULT_FIELDS`` in one pass."""
+
+    return [
+        dict(zip(RESULT_FIELDS, map(item.get, source_fields), strict=True))
+        for item in islice(items, limit)
+    ]
+
+
+def render_results(header: str, results: Iterable[dict[str, Any]]) -> str:
+    """Build the human-readable listing as one string for a single write."""
+
+    return "".join(
+        [f"{header}\n"]
+        + [
+            _RESULT_FMT.format_map(_ResultRow(result, i=i))
+            for i, result in enumerate(results, 1)
+        ]
+    )
+
+
+def dump_json(value: Any, *, indent: bool = True) -> str:
+    """Render CLI JSON output, using ``orjson``'s C encoder when present.
+
+    ``indent=False`` produces a compact single line, as NDJSON requires.
+    """
+
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(value, option=option).decode("utf-8")
+    if indent:
+        return json.dumps(value, indent=2)
+    return json.dumps(value, separators=(",", ":"))
+
+
 def validate_search_request(query: str, max_results: int) -> tuple[str, int]:
     """Bound provider-neutral user input before it reaches any network client."""
 
@@ -51,3 +282,23 @@ def validate_search_request(query: str, max_results: int) -> tuple[str, int]:
     if not 1 <= count <= 50:
         raise ValueError("max_results must be between 1 and 50")
     return rendered, count
+
+
+async def gather_bounded(
+    calls: Iterable[Callable[[], _T]], limit: int = _BATCH_CONCURRENCY
+) -> list[_T]:
+    """Run blocking provider calls on worker threads, at most ``limit`` at once.
+
+    Results keep the order of ``calls``. Every call still goes through
+    ``fetch_json``, so the shared pacing and egress policy apply unchanged.
+    """
+
+    import asyncio  # Only batch callers pay for the event-loop machinery.
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(call: Callable[[], _T]) -> _T:
+        async with semaphore:
+            return await asyncio.to_thread(call)
+
+    return await asyncio.gather(*(_run(call) for call in calls))
@@ -1,37 +1,222 @@
 #!/usr/bin/env python3
 import argparse
-import json
+import importlib
+import logging
 import os
 import sys
 
-from search_bing import search as search_bing
-from search_duckduckgo import search as search_duckduckgo
-from search_google import search as search_google
-from search_searxng import search as search_searxng
+# provider -> (module exposing ``search``, environment variables passed
+# positionally between the query and max_results). Order is the selection
+# priority. Modules are imported on first dispatch so ``--help`` and usage
+# errors never load the HTTP stack.
+_PROVIDERS = {
+    "searxng": ("search_searxng", ("SEARXNG_URL",)),
+    "google": ("search_google", ("GOOGLE_API_KEY", "GOOGLE_CX")),
+    "bing": ("search_bing", ("BING_API_KEY",)),
+    "duckduckgo": ("search_duckduckgo", ()),
+}
 
+# Upper bound on queries answered by one ``--batch`` invocation.
+_MAX_BATCH_QUERIES = 100
 
-def run_search_provider(provider: str, query: str, max_results: int):
+logger = logging.getLogger(__name__)
+
+
+def provider_credentials(environ=None) -> dict[str, tuple[str, ...]]:
+    """Resolve each provider's environment once; omit unconfigured providers."""
+
+    environ = os.environ if environ is None else environ
+    configured = {}
+    for provider, (_, names) in _PROVIDERS.items():
+        values = tuple(environ.get(name, "") for name in names)
+        if all(values):
+            configured[provider] = values
+    return configured
+
+
+def run_search_provider(
+    provider: str,
+    query: str,
+    max_results: int,
+    credentials: dict[str, tuple[str, ...]] | None = None,
+):
     """Dispatch through a fixed in-process provider map; never spawn a command."""
 
-    if provider == "searxng":
-        return search_searxng(query, os.environ["SEARXNG_URL"], max_results)
-    if provider == "google":
-        return search_google(
+    if provider not in _PROVIDERS:
+        raise ValueError("Unsupported search provider")
+    if credentials is None:
+        credentials = provider_credentials()
+    module, _ = _PROVIDERS[provider]
+    search = importlib.import_module(module).search
+    return search(query, *credentials[provider], max_results)
+
+
+def race_search_providers(
+    providers: list[str],
+    query: str,
+    max_results: int,
+    credentials: dict[str, tuple[str, ...]],
+):
+    """Query providers concurrently and return the first non-empty result.
+
+    An empty success is kept as a last resort; queued calls are cancelled once
+    a winner is found (calls already in flight finish in the background).
+    """
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    executor = ThreadPoolExecutor(max_workers=len(providers))
+    futures = {
+        executor.submit(
+            run_search_provider, provider, query, max_results, credentials
+        ): provider
+        for provider in providers
+    }
+    empty = None
+    try:
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as exc:
+                logger.debug(
+                    "%s search failed (%s)", futures[future], type(exc).__name__
+                )
+                continue
+            if results:
+                return futures[future], results
+            if empty is None:
+                empty = (futures[future], results)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    if empty is None:
+        raise RuntimeError("All search providers failed")
+    return empty
+
+
+def dispatch_search(
+    query: str,
+    max_results: int,
+    credentials: dict[str, tuple[str, ...]],
+    *,
+    fan_out: bool = False,
+    cache=None,
+):
+    """Answer one query from ``cache`` or the providers.
+
+    Returns ``(provider, results)``, or ``None`` when every provider failed.
+    Without ``fan_out`` the first configured provider is tried, then
+    DuckDuckGo as the final fallback.
+    """
+
+    # The first configured provider wins; DuckDuckGo needs no credentials.
+    provider = next(iter(credentials))
+    key = None
+    if cache is not None:
+        from search_cache import cache_key
+
+        # Provider settings are part of the digest so a different instance or
+        # account never serves another's cached answer.
+        key = cache_key(
+            "fan-out" if fan_out else "first",
             query,
-            os.environ["GOOGLE_API_KEY"],
-            os.environ["GOOGLE_CX"],
             max_results,
+            *(part for name, values in credentials.items() for part in (name, *values)),
         )
-    if provider == "bing":
-        return search_bing(query, os.environ["BING_API_KEY"], max_results)
-    if provider == "duckduckgo":
-        return search_duckduckgo(query, max_results)
-    raise ValueError("Unsupported search provider")
+        cached = cache.get(key)
+        # Anything but a ``[provider, results]`` pair is a damaged entry: a miss.
+        if (
+            isinstance(cached, list)
+            and len(cached) == 2
+            and isinstance(cached[0], str)
+            and isinstance(cached[1], list)
+        ):
+            provider, results = cached
+            return provider, results
+
+    try:
+        if fan_out:
+            provider, results = race_search_providers(
+                list(credentials), query, max_results, credentials
+            )
+        else:
+            results = run_search_provider(provider, query, max_results, credentials)
+    except Exception as exc:
+        logger.debug("%s search failed (%s)", provider, type(exc).__name__)
+        results = None
+
+    if results is None and not fan_out:
+        # If the preferred one failed, try DuckDuckGo as final fallback
+        if provider != "duckduckgo":
+            try:
+                results = run_search_provider(
+                    "duckduckgo", query, max_results, credentials
+                )
+                provider = "duckduckgo"
+            except Exception as exc:
+                logger.debug("duckduckgo search failed (%s)", type(exc).__name__)
+                results = None
+
+    if results is None:
+        return None
+    if results and key is not None:
+        cache.put(key, [provider, results])
+    return provider, results
+
+
+def run_batch(lines, max_results, credentials, *, fan_out=False, cache=None):
+    """Answer NDJSON ``{"query": ..., "max_results": N}`` lines concurrently.
+
+    Returns one record per non-blank line, in input order. Only the first
+    ``_MAX_BATCH_QUERIES`` are answered; later lines, bad lines, and failed
+    queries become ``{"line": n, "error": ...}`` records instead of aborting
+    the batch.
+    """
+
+    import asyncio
+    import json
+    from functools import partial
+    from itertools import islice
+
+    from http_runtime import gather_bounded
+
+    def answer(number: int, line: str) -> dict:
+        try:
+            request = json.loads(line)
+            query = request["query"]
+            limit = int(request.get("max_results", max_results))
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return {"line": number, "error": "invalid batch line"}
+        answered = dispatch_search(
+            query, limit, credentials, fan_out=fan_out, cache=cache
+        )
+        if answered is None:
+            return {"line": number, "error": "all search providers failed"}
+        provider, results = answered
+        return {"line": number, "provider": provider, "results": results}
+
+    numbered = ((n, line) for n, line in enumerate(lines, 1) if line.strip())
+    entries = list(islice(numbered, _MAX_BATCH_QUERIES))
+    records = asyncio.run(
+        gather_bounded(partial(answer, number, line) for number, line in entries)
+    )
+    # Lines past the cap are reported, never silently dropped.
+    records.extend(
+        {"line": number, "error": f"batch limit of {_MAX_BATCH_QUERIES} exceeded"}
+        for number, _ in numbered
+    )
+    return records
 
 
 def main():
     parser = argparse.ArgumentParser(description="Multi-Provider Web Search Dispatcher")
-    parser.add_argument("--query", required=True, help="The search query")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--query", help="The search query")
+    mode.add_argument(
+        "--batch",
+        action="store_true",
+        help='Read NDJSON {"query": ..., "max_results": N} lines from stdin, '
+        f"answer up to {_MAX_BATCH_QUERIES} concurrently, and write NDJSON",
+    )
     parser.add_argument(
         "--max-results",
         "--max_results",
@@ -42,47 +227,81 @@ def main():
     parser.add_argument(
         "--json", action="store_true", help="Output results in JSON format"
     )
+    parser.add_argument(
+        "--fan-out",
+        action="store_true",
+        help="Query every configured provider (and DuckDuckGo) concurrently and "
+        "use the first non-empty answer",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the local result cache for this query",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=None,
+        help="Seconds to keep cached results (default: $WEB_SEARCH_CACHE_TTL or "
+        "600; 0 disables caching)",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Report each failed provider (name and error type) on stderr",
+    )
 
     args = parser.parse_args()
-
-    # Determine which provider to use
-    provider = "duckduckgo"  # Default fallback
-
-    if os.environ.get("SEARXNG_URL"):
-        provider = "searxng"
-    elif os.environ.get("GOOGLE_API_KEY") and os.environ.get("GOOGLE_CX"):
-        provider = "google"
-    elif os.environ.get("BING_API_KEY"):
-        provider = "bing"
+    if args.verbose:
+        logging.basicConfig(level=logging.DEBUG, format="%(levelname)s: %(message)s")
 
     try:
-        results = run_search_provider(provider, args.query, args.max_results)
-    except Exception:
-        results = None
+        from http_runtime import dump_json, render_results
+    except ImportError:
+        print("Error: Missing required dependencies for the 'web-search' skill.")
+        print(
+            "Please install them by running: pip install 'universal-skills[web-search]'"
+        )
+        sys.exit(1)
+    from search_cache import SearchCache, ttl_from_env
 
-    if results is None:
-        # If the preferred one failed, try DuckDuckGo as final fallback
-        if provider != "duckduckgo":
-            try:
-                results = run_search_provider(
-                    "duckduckgo", args.query, args.max_results
-                )
-                provider = "duckduckgo"
-            except Exception:
-                results = None
+    credentials = provider_credentials()
+    ttl = ttl_from_env() if args.cache_ttl is None else max(0.0, args.cache_ttl)
+    cache = SearchCache(ttl=0.0 if args.no_cache else ttl)
 
-    if results is None:
+    if args.batch:
+        records = run_batch(
+            sys.stdin,
+            args.max_results,
+            credentials,
+            fan_out=args.fan_out,
+            cache=cache,
+        )
+        sys.stdout.write(
+            "".join(f"{dump_json(record, indent=False)}\n" for record in records)
+        )
+        if any("error" in record for record in records):
+            sys.exit(1)
+        return
+
+    answered = dispatch_search(
+        args.query,
+        args.max_results,
+        credentials,
+        fan_out=args.fan_out,
+        cache=cache,
+    )
+    if answered is None:
         print("Error: All search providers failed.", file=sys.stderr)
         sys.exit(1)
+    provider, results = answered
 
     if args.json:
-        print(json.dumps(results, indent=2))
+        print(dump_json(results))
     else:
-        print(f"--- Search Results (via {provider}) ---")
-        for i, result in enumerate(results, 1):
-            print(f"\n{i}. {result.get('title')}")
-            print(f"   URL: {result.get('link')}")
-            print(f"   Snippet: {result.get('snippet')}")
+        sys.stdout.write(
+            render_results(f"--- Search Results (via {provider}) ---", results)
+        )
 
 
 if __name__ == "__main__":
@@ -1,20 +1,28 @@
 #!/usr/bin/env python3
 import argparse
-import json
 import os
 import sys
 
 try:
-    from http_runtime import fetch_json, validate_search_request
+    from http_runtime import (
+        dump_json,
+        fetch_json,
+        project_results,
+        render_results,
+        validate_search_request,
+    )
 except ImportError:
     print("Error: Missing required dependencies for the 'web-search' skill.")
     print("Please install them by running: pip install 'universal-skills[web-search]'")
     sys.exit(1)
 
 
+# Bing field names for ``RESULT_FIELDS`` (title, link, snippet).
+_SOURCE_FIELDS = ("name", "url", "snippet")
+
+
 def search(query: str, api_key: str, max_results: int = 10):
     url = "https://api.bing.microsoft.com/v7.0/search"
-    results = []
 
     try:
         query, max_results = validate_search_request(query, max_results)
@@ -29,16 +37,7 @@ def search(query: str, api_key: str, max_results: int = 10):
         data = fetch_json(url, headers=headers, params=params)
 
         items = data.get("webPages", {}).get("value", [])
-        for item in items:
-            results.append(
-                {
-                    "title": item.get("name"),
-                    "link": item.get("url"),
-                    "snippet": item.get("snippet"),
-                }
-            )
-
-        return results
+        return project_results(items, _SOURCE_FIELDS)
     except Exception as exc:
         raise RuntimeError("Bing search failed") from exc
 
@@ -71,17 +70,15 @@ def main():
         sys.exit(1)
 
     if args.json:
-        print(json.dumps(results, indent=2))
+        print(dump_json(results))
     else:
         if not results:
             print(f"No results found for query: '{args.query}'")
             return
 
-        print(f"--- Bing Search Results for '{args.query}' ---")
-        for i, result in enumerate(results, 1):
-            print(f"\n{i}. {result['title']}")
-            print(f"   URL: {result['link']}")
-            print(f"   Snippet: {result['snippet']}")
+        sys.stdout.write(
+            render_results(f"--- Bing Search Results for '{args.query}' ---", results)
+        )
 
 
 if __name__ == "__main__":
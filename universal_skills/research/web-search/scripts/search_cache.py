@@ -0,0 +1,114 @@
+"""Small on-disk TTL cache for web-search results.
+
+Agent loops often repeat an identical query within minutes; answering those
+from a local SQLite file avoids a provider round-trip and its quota. Keys are
+BLAKE2b digests of the provider, query, result count, and provider settings,
+so neither queries nor credentials are stored in clear. The cache is
+best-effort: any filesystem or SQLite failure simply behaves as a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+DEFAULT_TTL = 600.0
+_MAX_ENTRIES = 512
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS results "
+    "(key TEXT PRIMARY KEY, expires REAL NOT NULL, value TEXT NOT NULL)"
+)
+
+
+def default_cache_path() -> Path:
+    """Return the per-user cache file under ``$XDG_CACHE_HOME`` (or ``~/.cache``)."""
+
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "universal-skills" / "web-search.sqlite3"
+
+
+def ttl_from_env(environ=None) -> float:
+    """Read ``WEB_SEARCH_CACHE_TTL`` seconds; invalid or negative values disable."""
+
+    environ = os.environ if environ is None else environ
+    raw = environ.get("WEB_SEARCH_CACHE_TTL", "")
+    if not raw:
+        return DEFAULT_TTL
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 0.0
+
+
+def cache_key(*parts: Any) -> str:
+    """Digest the lookup parts so the cache file never holds them verbatim."""
+
+    material = "\x1f".join(str(part) for part in parts)
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=32).hexdigest()
+
+
+class SearchCache:
+    """SQLite-backed result cache with per-entry expiry and a bounded size."""
+
+    def __init__(self, path: Path | None = None, ttl: float = DEFAULT_TTL) -> None:
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.ttl = ttl
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Open the private cache file, commit on success, and always close it."""
+
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if self.path.is_symlink():
+            raise OSError("search cache path is a symlink")
+        # Create the file 0600 before SQLite opens it with the process umask.
+        flags = os.O_WRONLY | os.O_CREAT
+        if hasattr(os, "O_NOFOLLOW"):
+            flags |= os.O_NOFOLLOW
+        os.close(os.open(self.path, flags, 0o600))
+        connection = sqlite3.connect(self.path, timeout=2.0)
+        try:
+            with connection:
+                connection.execute(_SCHEMA)
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, key: str) -> Any | None:
+        if self.ttl <= 0:
+            return None
+        try:
+            with self._transaction() as connection:
+                row = connection.execute(
+                    "SELECT value FROM results WHERE key = ? AND expires > ?",
+                    (key, time.time()),
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except (OSError, sqlite3.Error, ValueError):
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        now = time.time()
+        try:
+            with self._transaction() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                    (key, now + self.ttl, json.dumps(value)),
+                )
+                connection.execute("DELETE FROM results WHERE expires <= ?", (now,))
+                connection.execute(
+                    "DELETE FROM results WHERE key NOT IN "
+                    "(SELECT key FROM results ORDER BY expires DESC LIMIT ?)",
+                    (_MAX_ENTRIES,),
+                )
+        except (OSError, sqlite3.Error):
+            return
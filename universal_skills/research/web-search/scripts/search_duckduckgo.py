@@ -1,16 +1,50 @@
 #!/usr/bin/env python3
 import argparse
-import json
 import sys
+from functools import partial
 
 try:
-    from http_runtime import fetch_json, validate_search_request
+    from http_runtime import (
+        dump_json,
+        fetch_json,
+        gather_bounded,
+        project_results,
+        render_results,
+        validate_search_request,
+    )
 except ImportError:
     print("Error: Missing required dependencies for the 'web-search' skill.")
     print("Please install them by running: pip install 'universal-skills[web-search]'")
     sys.exit(1)
 
 
+# Instant Answer fields for ``RESULT_FIELDS``; the topic text doubles as the
+# snippet because the API has no separate summary.
+_SOURCE_FIELDS = ("Text", "FirstURL", "Text")
+
+
+def _iter_topics(data: dict):
+    """Yield linkable entries lazily so the caller can stop at ``max_results``.
+
+    ``RelatedTopics`` (flattening one level of nested ``Topics`` groups) is
+    preferred because it usually holds the web results; ``Results`` is the
+    fallback.
+    """
+
+    if "RelatedTopics" in data:
+        for topic in data["RelatedTopics"]:
+            if "FirstURL" in topic and "Text" in topic:
+                yield topic
+            elif "Topics" in topic:
+                yield from (
+                    sub_topic
+                    for sub_topic in topic["Topics"]
+                    if "FirstURL" in sub_topic and "Text" in sub_topic
+                )
+    elif "Results" in data:
+        yield from data["Results"]
+
+
 def search(query: str, max_results: int = 10):
     try:
         query, max_results = validate_search_request(query, max_results)
@@ -19,46 +53,19 @@ def search(query: str, max_results: int = 10):
         params = {"q": query, "format": "json", "no_html": 1, "skip_disambig": 1}
 
         data = fetch_json(url, params=params)
-        results = []
-
-        # DuckDuckGo API returns results in 'RelatedTopics' or 'Results'
-        # We prioritize 'RelatedTopics' as it often contains more relevant web results
-        if "RelatedTopics" in data:
-            for topic in data["RelatedTopics"]:
-                if "FirstURL" in topic and "Text" in topic:
-                    results.append(
-                        {
-                            "title": topic.get("Text"),
-                            "link": topic.get("FirstURL"),
-                            "snippet": topic.get(
-                                "Text"
-                            ),  # Use Text as snippet for simplicity
-                        }
-                    )
-                elif "Topics" in topic:  # Handle nested topics
-                    for sub_topic in topic["Topics"]:
-                        if "FirstURL" in sub_topic and "Text" in sub_topic:
-                            results.append(
-                                {
-                                    "title": sub_topic.get("Text"),
-                                    "link": sub_topic.get("FirstURL"),
-                                    "snippet": sub_topic.get("Text"),
-                                }
-                            )
-        elif "Results" in data:
-            for r in data["Results"]:
-                results.append(
-                    {
-                        "title": r.get("Text"),
-                        "link": r.get("FirstURL"),
-                        "snippet": r.get("Text"),
-                    }
-                )
-        return results[:max_results]
+        return project_results(_iter_topics(data), _SOURCE_FIELDS, max_results)
     except Exception as exc:
         raise RuntimeError("DuckDuckGo search failed") from exc
 
 
+async def search_many(queries: list[str], max_results: int = 10):
+    """Run several DuckDuckGo queries concurrently; results follow ``queries`` order."""
+
+    return await gather_bounded(
+        partial(search, query, max_results) for query in queries
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description="DuckDuckGo Web Search")
     parser.add_argument("--query", required=True, help="The search query")
@@ -81,17 +88,17 @@ def main():
         sys.exit(1)
 
     if args.json:
-        print(json.dumps(results, indent=2))
+        print(dump_json(results))
     else:
         if not results:
             print(f"No results found for query: '{args.query}'")
             return
 
-        print(f"--- DuckDuckGo Search Results for '{args.query}' ---")
-        for i, result in enumerate(results, 1):
-            print(f"\n{i}. {result['title']}")
-            print(f"   URL: {result['link']}")
-            print(f"   Snippet: {result['snippet']}")
+        sys.stdout.write(
+            render_results(
+                f"--- DuckDuckGo Search Results for '{args.query}' ---", results
+            )
+        )
 
 
 if __name__ == "__main__":
@@ -1,42 +1,54 @@
 #!/usr/bin/env python3
 import argparse
-import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 try:
-    from http_runtime import fetch_json, validate_search_request
+    from http_runtime import (
+        dump_json,
+        fetch_json,
+        project_results,
+        render_results,
+        validate_search_request,
+    )
 except ImportError:
     print("Error: Missing required dependencies for the 'web-search' skill.")
     print("Please install them by running: pip install 'universal-skills[web-search]'")
     sys.exit(1)
 
 
+_PAGE_SIZE = 10  # Custom Search returns at most 10 items per request.
+# Custom Search field names for ``RESULT_FIELDS`` (title, link, snippet).
+_SOURCE_FIELDS = ("title", "link", "snippet")
+
+
 def search(query: str, api_key: str, cx: str, max_results: int = 10):
     url = "https://www.googleapis.com/customsearch/v1"
     results = []
 
     try:
         query, max_results = validate_search_request(query, max_results)
-        # Google Custom Search API returns up to 10 results per page
-        # We might need to paginate if max_results > 10, but for simplicity, allow up to 10 for now
-        # Or we can do minimal pagination.
-        num = min(10, max_results)
-        params = {"key": api_key, "cx": cx, "q": query, "num": num}
-
-        data = fetch_json(url, params=params)
-
-        items = data.get("items", [])
-        for item in items:
-            results.append(
-                {
-                    "title": item.get("title"),
-                    "link": item.get("link"),
-                    "snippet": item.get("snippet"),
-                }
+        # Pages are addressed by 1-based ``start`` offsets (1, 11, 21, ...) and
+        # fetched concurrently, so 30 results cost one round-trip, not three.
+        base = {"key": api_key, "cx": cx, "q": query}
+        pages = [
+            {**base, "num": min(_PAGE_SIZE, max_results - start + 1), "start": start}
+            for start in range(1, max_results + 1, _PAGE_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+            responses = list(
+                executor.map(lambda params: fetch_json(url, params=params), pages)
             )
 
-        return results
+        for data in responses:
+            items = data.get("items", [])
+            results.extend(project_results(items, _SOURCE_FIELDS))
+            # A short page means the engine has no further results.
+            if len(items) < _PAGE_SIZE:
+                break
+
+        return results[:max_results]
     except Exception as exc:
         raise RuntimeError("Google search failed") from exc
 
@@ -49,7 +61,7 @@ def main():
         "--max_results",
         type=int,
         default=10,
-        help="Maximum number of results to return (up to 10 supported natively without pagination)",
+        help="Maximum number of results to return (1-50; pages of 10 are fetched concurrently)",
     )
     parser.add_argument(
         "--json", action="store_true", help="Output results in JSON format"
@@ -73,17 +85,15 @@ def main():
         sys.exit(1)
 
     if args.json:
-        print(json.dumps(results, indent=2))
+        print(dump_json(results))
     else:
         if not results:
             print(f"No results found for query: '{args.query}'")
             return
 
-        print(f"--- Google Search Results for '{args.query}' ---")
-        for i, result in enumerate(results, 1):
-            print(f"\n{i}. {result['title']}")
-            print(f"   URL: {result['link']}")
-            print(f"   Snippet: {result['snippet']}")
+        sys.stdout.write(
+            render_results(f"--- Google Search Results for '{args.query}' ---", results)
+        )
 
 
 if __name__ == "__main__":
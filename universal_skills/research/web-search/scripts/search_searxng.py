@@ -1,43 +1,110 @@
 #!/usr/bin/env python3
 import argparse
-import json
+import io
 import os
 import sys
+from collections.abc import Callable, Iterable
+from functools import lru_cache, partial
+from itertools import chain
 
 try:
-    from http_runtime import fetch_json, validate_search_request
+    from http_runtime import (
+        JSON_ACCEPT_HEADERS,
+        decode_json,
+        dump_json,
+        fetch_bytes,
+        gather_bounded,
+        is_utf8_charset,
+        project_results,
+        render_results,
+        validate_search_request,
+    )
 except ImportError:
     print("Error: Missing required dependencies for the 'web-search' skill.")
     print("Please install them by running: pip install 'universal-skills[web-search]'")
     sys.exit(1)
 
+try:  # Optional incremental parser; the full-document decode is the fallback.
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# SearXNG field names for ``RESULT_FIELDS`` (title, link, snippet).
+_SOURCE_FIELDS = ("title", "url", "content")
+
+
+# ``fetch_bytes``-compatible transport: (url, *, params, headers) -> (body, charset).
+Fetch = Callable[..., tuple[bytes, str | None]]
+
+
+def _result_items(url: str, params: dict, fetch: Fetch) -> Iterable[dict]:
+    """Return the raw entries of the ``results`` array.
+
+    With ``ijson`` this is a lazy iterator over the body, so parsing stops as
+    soon as the caller has taken enough entries and ``infoboxes``,
+    ``suggestions``, and surplus results are never materialised.
+    """
+
+    body, encoding = fetch(url, params=params, headers=JSON_ACCEPT_HEADERS)
+    if ijson is None:
+        return decode_json(body, encoding).get("results", [])
+    if not is_utf8_charset(encoding):
+        body = body.decode(encoding).encode("utf-8")
+    events = ijson.parse(io.BytesIO(body))
+    # Same top-level contract as ``decode_json``: the body must be an object.
+    first = next(events, None)
+    if first is None or first[1] != "start_map":
+        raise ValueError("Search provider returned an invalid JSON shape")
+    return ijson.items(chain((first,), events), "results.item")
+
+
+@lru_cache(maxsize=4)
+def _endpoint(base_url: str) -> str:
+    """Return the JSON search endpoint; memoised for the fixed configured URL."""
 
-def search(query: str, base_url: str, max_results: int = 10):
-    # Ensure there is no trailing slash
-    base_url = base_url.rstrip("/")
-    url = f"{base_url}/search"
-    results = []
+    return base_url.rstrip("/") + "/search"
+
+
+def search(
+    query: str,
+    base_url: str,
+    max_results: int = 10,
+    *,
+    fetch: Fetch | None = None,
+):
+    """Query a SearXNG instance's JSON API.
+
+    ``fetch`` defaults to the policy-enforced ``http_runtime.fetch_bytes``. An
+    embedding application or test may pass its own callable with the same
+    signature, for example one that adds tracing or replays recorded bodies.
+    """
+
+    url = _endpoint(base_url)
 
     try:
         query, max_results = validate_search_request(query, max_results)
         params = {"q": query, "format": "json"}
-        data = fetch_json(url, params=params)
-
-        items = data.get("results", [])
-        for item in items[:max_results]:
-            results.append(
-                {
-                    "title": item.get("title"),
-                    "link": item.get("url"),
-                    "snippet": item.get("content"),
-                }
-            )
-
-        return results
+        items = _result_items(url, params, fetch or fetch_bytes)
+        return project_results(items, _SOURCE_FIELDS, max_results)
     except Exception as exc:
         raise RuntimeError("SearxNG search failed") from exc
 
 
+async def search_many(
+    queries: list[str],
+    base_url: str,
+    max_results: int = 10,
+    *,
+    fetch: Fetch | None = None,
+):
+    """Run several SearXNG queries concurrently; results follow ``queries`` order."""
+
+    return await gather_bounded(
+        partial(search, query, base_url, max_results, fetch=fetch) for query in queries
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description="Searxng Web Search")
     parser.add_argument("--query", required=True, help="The search query")
@@ -68,17 +135,17 @@ def main():
         sys.exit(1)
 
     if args.json:
-        print(json.dumps(results, indent=2))
+        print(dump_json(results))
     else:
         if not results:
             print(f"No results found for query: '{args.query}'")
             return
 
-        print(f"--- Searxng Search Results for '{args.query}' ---")
-        for i, result in enumerate(results, 1):
-            print(f"\n{i}. {result['title']}")
-            print(f"   URL: {result['link']}")
-            print(f"   Snippet: {result['snippet']}")
+        sys.stdout.write(
+            render_results(
+                f"--- Searxng Search Results for '{args.query}' ---", results
+            )
+        )
 
 
 if __name__ == "__main__":